@@ -0,0 +1,295 @@
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from scheduler import ALGORITHMS, read_trace, round_robin, schedule_events, write_trace
+from workload_gen import BURST_DISTRIBUTIONS, PRIORITY_DISTRIBUTIONS, generate
+
+# Scaling benchmarks: python benchmark.py [--sizes 1000,10000] [--update-baseline]
+#
+# Times every scheduling algorithm, the lazy event stream, metrics, trace
+# save / load and Gantt rendering on seeded synthetic workloads of 10^3 to
+# 10^6 processes. Each case is timed best-of-N without tracing, then run once
+# more under tracemalloc for its peak Python / NumPy allocation (Qt's own
+# allocations are not seen). The report gives the time per size, the scaling
+# exponent (slope of log time against log size) and the peak at the largest
+# size.
+#
+# Results are compared with BASELINE when it exists: a case is a regression
+# when its time, scaled by the calibrate() ratio between the two machines, or
+# its memory peak grows by more than --tolerance. The exit status is 1 on
+# any regression, so the script can gate a change.
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+SIZES = (1000, 10000, 100000, 1000000)
+PARAMS = {"round_robin": {"time_quantum": 4}, "mlfq": {"q1": 4, "q2": 8}}
+REPEAT_BELOW = 1.0  # seconds; slower runs are timed once
+MIN_SAMPLE_TIME = 0.2  # seconds; faster cases are rerun past --repeat until this much has been spent
+NOISE_FLOOR = 0.005  # seconds; faster timings are not compared
+MEMORY_SLACK = 1 << 16  # bytes of peak growth always allowed
+GANTT_SIZE = (1600, 200)
+
+_app = None  # QApplication kept alive for the Gantt cases
+
+
+def calibrate(repeat=9):
+    # Fixed mix of interpreter and NumPy work, to scale timings taken on
+    # another machine
+    best = math.inf
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        heap = []
+        for i in range(200000):
+            heap.append((i * 7919) % 10007)
+        heap.sort()
+        np.sort(np.random.default_rng(0).integers(0, 1 << 30, 1 << 20))
+        best = min(best, time.perf_counter() - begin)
+    return best
+
+
+def _drain(events):
+    count = 0
+    for _ in events:
+        count += 1
+    return count
+
+
+def cases(table, directory, gantt=True):
+    # (name, zero-argument callable) for one workload; the schedule the
+    # metrics, trace and Gantt cases work on is computed here, untimed
+    result = [(name, lambda name=name: ALGORITHMS[name](table, **PARAMS.get(name, {})))
+              for name in ALGORITHMS]
+    result.append(("schedule_events", lambda: _drain(schedule_events(table, "round_robin",
+                                                                     **PARAMS["round_robin"]))))
+    schedule = round_robin(table, **PARAMS["round_robin"])
+    path = os.path.join(directory, "benchmark.trace")
+    write_trace(schedule, path)
+
+    def load_trace():
+        loaded = read_trace(path)
+        return int(loaded.table.finish_time.sum()) + len(loaded.timeline)
+
+    result += [
+        ("summary", schedule.summary),
+        ("write_trace", lambda: write_trace(schedule, path)),
+        ("write_trace_compressed", lambda: write_trace(schedule, path + ".z", compress=True)),
+        ("read_trace", load_trace),
+    ]
+    if gantt:
+        result += _gantt_cases(schedule)
+    return result
+
+
+def _gantt_cases(schedule):
+    # Off-screen repaints of the whole schedule (bucketed) and of a zoomed-in
+    # window in the middle of it (slice by slice)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+
+    from gantt import GanttChart
+
+    global _app
+    _app = QApplication.instance() or QApplication([])
+    chart = GanttChart()
+    chart.resize(*GANTT_SIZE)
+    chart.show()
+    chart.set_schedule(schedule)
+    _app.processEvents()
+
+    def render_zoomed():
+        chart.zoom(chart.zoom_limit() / chart.pixels_per_unit)
+        scrollbar = chart.horizontalScrollBar()
+        scrollbar.setValue(scrollbar.maximum() // 2)
+        image = chart.viewport().grab()
+        chart.fit()
+        return image
+
+    return [("gantt_fit", lambda: chart.viewport().grab()), ("gantt_zoomed", render_zoomed)]
+
+
+def measure(function, repeat):
+    # Best-of-`repeat` seconds (more runs for fast cases), then the peak
+    # bytes allocated by one more run
+    best = math.inf
+    runs = spent = 0
+    while runs < repeat or spent < MIN_SAMPLE_TIME:
+        gc.collect()
+        begin = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - begin
+        best = min(best, elapsed)
+        runs += 1
+        spent += elapsed
+        if elapsed > REPEAT_BELOW:
+            break
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run(sizes, workload, repeat=3, gantt=True, time_limit=None, log=None):
+    # {case: {size: {"seconds", "peak_bytes"}}}. A case that takes longer
+    # than `time_limit` seconds is not run at the larger sizes.
+    results = {}
+    skipped = set()
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            table = generate(size, **workload)
+            for name, function in cases(table, directory, gantt):
+                if name in skipped:
+                    continue
+                seconds, peak = measure(function, repeat)
+                results.setdefault(name, {})[str(size)] = {"seconds": seconds, "peak_bytes": peak}
+                if log is not None:
+                    log(f"{name:<24} {size:>9}  {_seconds(seconds):>9}  {_bytes(peak):>9}")
+                if time_limit is not None and seconds > time_limit:
+                    skipped.add(name)
+    return results
+
+
+def scaling_exponent(timings):
+    # Least-squares slope of log(seconds) against log(size): about 1 for
+    # linear work, 2 for quadratic
+    points = [(math.log(int(size)), math.log(entry["seconds"]))
+              for size, entry in timings.items() if entry["seconds"] > 0]
+    if len(points) < 2:
+        return None
+    x, y = np.array(points).T
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def compare(report, baseline, tolerance):
+    # Regressions as (case, size, what, baseline value, new value), timings
+    # scaled to this machine by the calibration ratio
+    speed = report["calibration"] / baseline["calibration"]
+    regressions = []
+    for name, timings in report["results"].items():
+        for size, entry in timings.items():
+            old = baseline["results"].get(name, {}).get(size)
+            if old is None:
+                continue
+            expected = old["seconds"] * speed
+            if max(expected, entry["seconds"]) >= NOISE_FLOOR and entry["seconds"] > expected * (1 + tolerance):
+                regressions.append((name, size, "time", _seconds(expected), _seconds(entry["seconds"])))
+            if entry["peak_bytes"] > old["peak_bytes"] * (1 + tolerance) + MEMORY_SLACK:
+                regressions.append((name, size, "memory", _bytes(old["peak_bytes"]), _bytes(entry["peak_bytes"])))
+    return regressions
+
+
+def print_report(report, out=sys.stdout):
+    sizes = report["config"]["sizes"]
+    header = f"{'case':<24}" + "".join(f"{'n=' + _size(size):>10}" for size in sizes) + f"{'slope':>8}{'peak':>10}"
+    print(header, file=out)
+    for name, timings in report["results"].items():
+        cells = "".join(f"{_seconds(timings[str(size)]['seconds']) if str(size) in timings else '-':>10}"
+                        for size in sizes)
+        slope = scaling_exponent(timings)
+        largest = timings[max(timings, key=int)]
+        print(f"{name:<24}{cells}{'-' if slope is None else f'{slope:.2f}':>8}{_bytes(largest['peak_bytes']):>10}",
+              file=out)
+
+
+def _size(value):
+    # 1000 -> "1e3"; other sizes as they are
+    exponent = round(math.log10(value)) if value > 0 else 0
+    return f"1e{exponent}" if 10 ** exponent == value else str(value)
+
+
+def _seconds(value):
+    if value >= 1:
+        return f"{value:.2f}s"
+    if value >= 1e-3:
+        return f"{value * 1e3:.1f}ms"
+    return f"{value * 1e6:.0f}us"
+
+
+def _bytes(value):
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.0f}{unit}"
+        value /= 1024
+    return f"{value:.1f}GB"
+
+
+def _sizes(text):
+    try:
+        return sorted({int(float(size)) for size in text.split(",")})
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated sizes, got '{text}'")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmark", description="Time the scheduler at growing workload sizes.")
+    parser.add_argument("--sizes", type=_sizes, default=list(SIZES),
+                        help="comma-separated process counts (default: 1e3,1e4,1e5,1e6)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, best kept (default: 3)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--burst", choices=BURST_DISTRIBUTIONS, default="bimodal")
+    parser.add_argument("--priority", choices=PRIORITY_DISTRIBUTIONS, default="zipf")
+    parser.add_argument("--no-gantt", action="store_true", help="skip Gantt rendering (needs PyQt5)")
+    parser.add_argument("--time-limit", type=float,
+                        help="skip the larger sizes of a case once one run takes longer (seconds)")
+    parser.add_argument("-o", "--output", help="write the report as JSON")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline report to compare with")
+    parser.add_argument("--update-baseline", action="store_true", help="store this report as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed slowdown or memory growth before a regression (default: 0.5)")
+    args = parser.parse_args(argv)
+
+    workload = {"seed": args.seed, "burst": args.burst, "priority": args.priority}
+    config = {"sizes": args.sizes, "workload": workload, "repeat": args.repeat}
+    # Calibrated before and after the run, keeping the faster, so a burst of
+    # load on the machine at either end does not skew the comparison
+    calibration = calibrate()
+    results = run(args.sizes, workload, args.repeat, not args.no_gantt, args.time_limit,
+                  lambda line: print(line, file=sys.stderr))
+    report = {
+        "machine": {"python": platform.python_version(), "numpy": np.__version__,
+                    "platform": platform.platform(), "processor": platform.processor()},
+        "calibration": min(calibration, calibrate()),
+        "config": config,
+        "results": results,
+    }
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["config"]["workload"] != workload:
+        print("baseline was recorded on a different workload; not compared")
+        return 0
+    regressions = compare(report, baseline, args.tolerance)
+    if not regressions:
+        print(f"no regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+        return 0
+    print(f"{len(regressions)} regression(s) against {args.baseline}:")
+    for name, size, what, old, new in regressions:
+        print(f"  {name} n={size} {what}: {old} -> {new}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
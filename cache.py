@@ -0,0 +1,199 @@
+import hashlib
+import inspect
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from process import ProcessTable
+from scheduler import ALGORITHMS, Schedule
+from timeline import Timeline
+
+# Cache of scheduling results keyed by a content hash of the workload's
+# (arrival_time, burst_time, priority) columns, the algorithm name and its
+# parameters (defaults filled in). PIDs are not part of the key: a cached
+# schedule is stored by row position and re-attached to whichever workload
+# asks for it. An entry may hold the full schedule, the summary metrics of a
+# comparison / sweep run, or both.
+#
+# The in-memory tier is an LRU bounded by the bytes of the stored arrays. The
+# optional on-disk tier keeps one .npz file per entry in `directory`.
+
+
+def fingerprint(table):
+    # Content hash of the scheduling-relevant columns; tables are read-only,
+    # so it is computed once per table
+    cached = getattr(table, "_fingerprint", None)
+    if cached is None:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.int64(len(table)).tobytes())
+        for name in ("arrival_time", "burst_time", "priority"):
+            digest.update(np.ascontiguousarray(getattr(table, name)).tobytes())
+        cached = digest.hexdigest()
+        table._fingerprint = cached
+    return cached
+
+
+def normalized_params(algorithm, params):
+    # Parameters with defaults applied, so mlfq() and mlfq(q1=4) share a key
+    bound = inspect.signature(ALGORITHMS[algorithm]).bind_partial(None, **params)
+    bound.apply_defaults()
+    return {name: value for name, value in bound.arguments.items() if name not in ("table", "progress")}
+
+
+def cache_key(table, algorithm, params):
+    params_text = json.dumps(normalized_params(algorithm, params), sort_keys=True)
+    return f"{fingerprint(table)}-{algorithm}-{hashlib.blake2b(params_text.encode(), digest_size=8).hexdigest()}"
+
+
+class _Entry:
+    __slots__ = ("arrays", "metrics")
+
+    def __init__(self, arrays=None, metrics=None):
+        self.arrays = arrays  # order, start/finish time, timeline columns
+        self.metrics = metrics
+
+    @property
+    def nbytes(self):
+        return 1024 + sum(array.nbytes for array in (self.arrays or {}).values())
+
+
+def _holds(entry, want_schedule):
+    if entry is None:
+        return False
+    return (entry.arrays if want_schedule else entry.metrics) is not None
+
+
+class ScheduleCache:
+    def __init__(self, max_bytes=256 * 1024 * 1024, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    # --- Schedules ---
+
+    def get_schedule(self, table, algorithm, params):
+        entry = self._get(cache_key(table, algorithm, params), want_schedule=True)
+        if entry is None:
+            return None
+        arrays = entry.arrays
+        result = table.take(arrays["order"])
+        result.start_time = arrays["start_time"]
+        result.finish_time = arrays["finish_time"]
+        timeline = Timeline(arrays["timeline_row"], arrays["timeline_start"], arrays["timeline_end"])
+        return Schedule(result.compute_metrics(), timeline, arrays["order"])
+
+    def put_schedule(self, table, algorithm, params, schedule, metrics=None):
+        arrays = {
+            "order": np.asarray(schedule.order, dtype=np.int64),
+            "start_time": schedule.table.start_time,
+            "finish_time": schedule.table.finish_time,
+            "timeline_row": schedule.timeline.row,
+            "timeline_start": schedule.timeline.start,
+            "timeline_end": schedule.timeline.end,
+        }
+        for name, array in arrays.items():
+            arrays[name] = array.view()
+            arrays[name].flags.writeable = False
+        self._put(cache_key(table, algorithm, params), arrays, metrics)
+
+    def schedule(self, workload, algorithm, params=None, progress=None):
+        # Cached schedule of `workload`, computing and storing it on a miss
+        table = workload if isinstance(workload, ProcessTable) else ProcessTable.from_processes(workload)
+        params = params or {}
+        schedule = self.get_schedule(table, algorithm, params)
+        if schedule is None:
+            schedule = ALGORITHMS[algorithm](table, progress=progress, **params)
+            self.put_schedule(table, algorithm, params, schedule)
+        return schedule
+
+    # --- Summary metrics (comparisons and sweeps) ---
+
+    def get_metrics(self, table, algorithm, params):
+        entry = self._get(cache_key(table, algorithm, params), want_schedule=False)
+        return None if entry is None else dict(entry.metrics)
+
+    def put_metrics(self, table, algorithm, params, metrics):
+        self._put(cache_key(table, algorithm, params), None, dict(metrics))
+
+    # --- Storage ---
+
+    def _get(self, key, want_schedule):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if not _holds(entry, want_schedule):
+            entry = self._load(key, entry)
+        if not _holds(entry, want_schedule):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def _put(self, key, arrays, metrics):
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None:
+                arrays = arrays if arrays is not None else previous.arrays
+                metrics = metrics if metrics is not None else previous.metrics
+            entry = _Entry(arrays, metrics)
+            self._insert(key, entry)
+        self._store(key, entry)
+
+    def _insert(self, key, entry):
+        # Caller holds the lock
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        self._entries[key] = entry
+        self._bytes += entry.nbytes
+        # Evict least recently used entries, but always keep the newest
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def _store(self, key, entry):
+        if self.directory is None:
+            return
+        data = dict(entry.arrays or {})
+        data["metrics"] = np.array(json.dumps(entry.metrics))
+        # Write then rename, so readers never see a partial file
+        temporary = self._path(key) + f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "wb") as f:
+            np.savez(f, **data)
+        os.replace(temporary, self._path(key))
+
+    def _load(self, key, entry):
+        # Disk tier lookup; a hit is promoted into memory
+        if self.directory is None or not os.path.exists(self._path(key)):
+            return entry
+        try:
+            with np.load(self._path(key)) as data:
+                metrics = json.loads(str(data["metrics"]))
+                arrays = {name: data[name] for name in data.files if name != "metrics"} or None
+        except (OSError, ValueError, KeyError):
+            return entry
+        loaded = _Entry(arrays, metrics)
+        with self._lock:
+            self._insert(key, loaded)
+        return loaded
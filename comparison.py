@@ -0,0 +1,142 @@
+import contextlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from metrics import SUMMARY_METRICS
+from process import ProcessTable
+from scheduler import ALGORITHMS
+
+# Side-by-side comparison of algorithms on one workload. Runs go to a process
+# pool. The workload columns are copied once into a shared memory block that
+# every worker maps, so only the block's name is sent to the workers, not the
+# workload itself.
+
+DEFAULT_RUNS = [
+    ("fcfs", {}),
+    ("sjf_non_preemptive", {}),
+    ("priority_non_preemptive", {}),
+    ("srtf", {}),
+    ("priority_preemptive", {}),
+    ("round_robin", {"time_quantum": 4}),
+    ("mlfq", {}),
+]
+
+METRICS = ("average_waiting_time", "average_turnaround_time", "average_response_time",
+           "throughput", "cpu_utilization", "wall_clock_seconds")
+HIGHER_IS_BETTER = {"throughput", "cpu_utilization"}
+MEASURED_METRICS = SUMMARY_METRICS + ("wall_clock_seconds",)  # every key measure() reports
+
+_workload = None  # this worker's view of the shared workload, set by _init_worker
+_shared = None  # the SharedMemory block it maps, kept open while the worker lives
+
+
+def _init_worker(name, size):
+    global _workload, _shared
+    _shared = shared_memory.SharedMemory(name)
+    columns = np.ndarray((len(ProcessTable.workload_columns), size), dtype=np.int64, buffer=_shared.buf)
+    _workload = ProcessTable(*columns)
+
+
+def measure(workload, name, params):
+    # Schedule once and return the summary metrics plus wall-clock cost
+    started = time.perf_counter()
+    schedule = ALGORITHMS[name](workload, **params)
+    metrics = schedule.table.summary() if len(schedule) else {}
+    metrics["wall_clock_seconds"] = time.perf_counter() - started
+    return dict(metrics, algorithm=name, params=params)
+
+
+def measure_in_worker(name, params):
+    return measure(_workload, name, params)
+
+
+@contextlib.contextmanager
+def pool(workload, jobs):
+    # Process pool whose workers map `workload` from shared memory, released
+    # when the pool is shut down. Spawned rather than forked so a GUI's
+    # threads are never copied into the children.
+    workers = max(1, min(jobs, os.cpu_count() or 1))
+    names = ProcessTable.workload_columns
+    shared = shared_memory.SharedMemory(create=True, size=max(1, len(names) * len(workload) * 8))
+    try:
+        columns = np.ndarray((len(names), len(workload)), dtype=np.int64, buffer=shared.buf)
+        for row, name in enumerate(names):
+            columns[row] = getattr(workload, name)
+        del columns  # no exported views may outlive close()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(shared.name, len(workload))) as executor:
+            yield executor
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def run_parallel(executor, function, argument_list, progress=None):
+    # Submit function(*arguments) for each entry and collect the results in
+    # submission order. progress(done, total) may raise to stop early; runs
+    # that have not started yet are then cancelled.
+    futures = {executor.submit(function, *arguments): i for i, arguments in enumerate(argument_list)}
+    results = [None] * len(futures)
+    try:
+        for done, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            if progress is not None:
+                progress(done, len(futures))
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    return results
+
+
+def measure_all(workload, runs, max_workers=None, progress=None, cache=None):
+    # Metrics for each (algorithm name, params) in `runs`, in order. Runs
+    # found in `cache` (a ScheduleCache) are not repeated; the rest go to a
+    # process pool, or run in this process when only one worker is wanted.
+    rows = [None] * len(runs)
+    if cache is not None:
+        for i, (name, params) in enumerate(runs):
+            rows[i] = cache.get_metrics(workload, name, params)
+            if rows[i] is not None:
+                rows[i]["cached"] = True
+    pending = [i for i, row in enumerate(rows) if row is None]
+
+    if max_workers == 1 or len(pending) == 1:
+        computed = []
+        for done, i in enumerate(pending, 1):
+            computed.append(measure(workload, *runs[i]))
+            if progress is not None:
+                progress(done, len(pending))
+    elif pending:
+        with pool(workload, max_workers or len(pending)) as executor:
+            computed = run_parallel(executor, measure_in_worker, [runs[i] for i in pending], progress)
+    else:
+        computed = []
+
+    for i, row in zip(pending, computed):
+        if cache is not None:
+            cache.put_metrics(workload, *runs[i], row)
+        rows[i] = dict(row, cached=False)
+    return rows
+
+
+def rank(rows, rank_by="average_waiting_time"):
+    # Sort rows best-first by one metric and number them
+    reverse = rank_by in HIGHER_IS_BETTER
+    ordered = sorted(rows, key=lambda row: row.get(rank_by, 0), reverse=reverse)
+    for position, row in enumerate(ordered, 1):
+        row["rank"] = position
+    return ordered
+
+
+def compare_algorithms(workload, runs=DEFAULT_RUNS, rank_by="average_waiting_time", max_workers=None,
+                       progress=None, cache=None):
+    # Run every (algorithm name, params) pair on `workload` in parallel and
+    # return one metrics dict per run, ranked by `rank_by`
+    if not isinstance(workload, ProcessTable):
+        workload = ProcessTable.from_processes(workload)
+    return rank(measure_all(workload, runs, max_workers, progress, cache), rank_by)
@@ -0,0 +1,299 @@
+import numpy as np
+from PyQt5.QtWidgets import QAbstractScrollArea
+from PyQt5.QtGui import QPainter, QColor
+from PyQt5.QtCore import Qt, QRect, QRectF, pyqtSignal
+
+import instrumentation
+from timeline import IDLE
+
+
+class GanttChart(QAbstractScrollArea):
+    # Scrollable, zoomable Gantt chart over a Timeline. Only the visible time
+    # window is painted: when slices are narrower than a few pixels they are
+    # aggregated into fixed-width pixel buckets, so the cost of a repaint
+    # depends on the viewport width, not on the length of the schedule.
+    # Multi-CPU schedules get one lane per core. During playback a cursor
+    # marks the current time and the part of the chart not played yet is
+    # dimmed; moving the cursor repaints only the strip it passed over.
+
+    chart_height = 100  # height of a single lane
+    max_chart_height = 400  # all lanes together, for many cores
+    min_lane_height = 4
+    label_height = 30
+    min_slice_pixels = 4  # narrower slices switch to bucketed drawing
+    bucket_pixels = 2
+    max_pixels_per_unit = 200.0
+    max_content_width = 2 ** 31 - 1  # scroll range is a C int
+
+    colors = [QColor('#3498db'), QColor('#2ecc71'), QColor('#e74c3c'),
+              QColor('#9b59b6'), QColor('#f1c40f'), QColor('#e67e22'), QColor('#1abc9c')]
+    unplayed_color = QColor(240, 240, 240, 170)
+    cursor_color = QColor('#c0392b')
+
+    seek_requested = pyqtSignal(float)  # time clicked on the chart
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.schedule = None
+        self.cursor = None  # playback time, None when not playing back
+        self.pixels_per_unit = 30.0
+        self.lane_height = self.chart_height
+        self.setFixedHeight(self.chart_height + self.label_height + 20)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.viewport().setStyleSheet("background-color: white;")
+
+    def set_schedule(self, schedule):
+        self.schedule = schedule
+        self.cursor = None
+        if schedule is not None:
+            self._pids = schedule.table.pid
+            lanes = len(schedule.timelines)
+            self.lane_height = max(self.min_lane_height, min(self.chart_height, self.max_chart_height // lanes))
+            self.setFixedHeight(self.lane_height * lanes + self.label_height + 20)
+            self.fit()
+        self._update_scrollbar()
+        self.viewport().update()
+
+    def clear(self):
+        self.set_schedule(None)
+
+    def set_cursor(self, time):
+        # Move the playback cursor, scrolling to keep it in view; only the
+        # strip between the old and new cursor is repainted
+        old_x = None if self.cursor is None else self.x_at(self.cursor)
+        self.cursor = time
+        if time is None:
+            self.viewport().update()
+            return
+        new_x = self.x_at(time)
+        width = self.viewport().width()
+        if not 0 <= new_x < width:
+            # Page so the cursor is a quarter into the view (repaints it all)
+            self.horizontalScrollBar().setValue(int(time * self.pixels_per_unit - width / 4))
+            self.viewport().update()
+            return
+        if old_x is None:
+            old_x = new_x
+        left = int(min(old_x, new_x)) - 2
+        right = int(max(old_x, new_x)) + 3
+        self.viewport().update(QRect(left, 0, right - left, self.viewport().height()))
+
+    # --- Zoom and scrolling ---
+
+    def total_time(self):
+        return self.schedule.end_time if self.schedule is not None else 0
+
+    def min_pixels_per_unit(self):
+        # Zooming out stops once the whole schedule fits in the viewport
+        total_time = self.total_time()
+        if not total_time:
+            return self.max_pixels_per_unit
+        return min(self.zoom_limit(), max(1, self.viewport().width()) / total_time)
+
+    def zoom_limit(self):
+        # Zooming in stops at max_pixels_per_unit, or earlier on schedules
+        # long enough to overflow the scroll range
+        total_time = self.total_time()
+        if not total_time:
+            return self.max_pixels_per_unit
+        return min(self.max_pixels_per_unit, self.max_content_width / total_time)
+
+    def fit(self):
+        self.pixels_per_unit = min(30.0, self.zoom_limit(), self.min_pixels_per_unit())
+        self.horizontalScrollBar().setValue(0)
+
+    def zoom(self, factor, anchor_x=0):
+        # Zoom by `factor` keeping the time under viewport x = anchor_x in place
+        anchor_time = self.time_at(anchor_x)
+        self.pixels_per_unit = min(self.zoom_limit(),
+                                   max(self.min_pixels_per_unit(), self.pixels_per_unit * factor))
+        self._update_scrollbar()
+        self.horizontalScrollBar().setValue(int(anchor_time * self.pixels_per_unit - anchor_x))
+        self.viewport().update()
+
+    def zoom_in(self):
+        self.zoom(2.0, self.viewport().width() // 2)
+
+    def zoom_out(self):
+        self.zoom(0.5, self.viewport().width() // 2)
+
+    def time_at(self, x):
+        return (self.horizontalScrollBar().value() + x) / self.pixels_per_unit
+
+    def x_at(self, time):
+        return time * self.pixels_per_unit - self.horizontalScrollBar().value()
+
+    def _update_scrollbar(self):
+        content_width = int(np.ceil(self.total_time() * self.pixels_per_unit))
+        scrollbar = self.horizontalScrollBar()
+        scrollbar.setRange(0, max(0, content_width - self.viewport().width()))
+        scrollbar.setPageStep(self.viewport().width())
+        scrollbar.setSingleStep(max(1, int(self.pixels_per_unit)))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.pixels_per_unit = max(self.pixels_per_unit, self.min_pixels_per_unit())
+        self._update_scrollbar()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if event.modifiers() & Qt.ControlModifier:
+            self.zoom(1.25 ** steps, event.pos().x())
+        else:
+            scrollbar = self.horizontalScrollBar()
+            scrollbar.setValue(scrollbar.value() - int(steps * scrollbar.pageStep() / 4))
+        event.accept()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self.schedule is not None:
+            self.seek_requested.emit(min(max(0.0, self.time_at(event.pos().x())), float(self.total_time())))
+            event.accept()
+        else:
+            super().mousePressEvent(event)
+
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key_Plus, Qt.Key_Equal):
+            self.zoom_in()
+        elif event.key() == Qt.Key_Minus:
+            self.zoom_out()
+        elif event.key() == Qt.Key_0:
+            self.fit()
+            self._update_scrollbar()
+            self.viewport().update()
+        else:
+            super().keyPressEvent(event)
+
+    # --- Painting ---
+
+    def paintEvent(self, event):
+        with instrumentation.phase("render"):
+            self._paint(event)
+
+    def _paint(self, event):
+        painter = QPainter(self.viewport())
+        painter.fillRect(event.rect(), QColor('#f0f0f0'))  # Light background
+        if self.schedule is None or not self.schedule.end_time:
+            painter.end()
+            return
+
+        font = painter.font()
+        font.setPointSize(10)
+        font.setBold(True)
+        painter.setFont(font)
+
+        # Visible time window, limited to the area being repainted
+        rect = event.rect()
+        begin = max(0.0, self.time_at(rect.left()))
+        end = min(float(self.total_time()), self.time_at(rect.right() + 1))
+        if end > begin:
+            for lane, timeline in enumerate(self.schedule.timelines):
+                if not len(timeline):
+                    continue
+                first, last = timeline.window(begin, end)
+                if (last - first) * self.min_slice_pixels <= rect.width():
+                    self._paint_slices(painter, lane, first, last)
+                else:
+                    self._paint_buckets(painter, rect, lane)
+            self._paint_axis(painter, rect, begin, end)
+            self._paint_lane_labels(painter)
+        if self.cursor is not None:
+            self._paint_cursor(painter, rect)
+        painter.end()
+
+    def _paint_slices(self, painter, lane, first, last):
+        timeline = self.schedule.timelines[lane]
+        top = lane * self.lane_height
+        rows = timeline.row[first:last].tolist()
+        starts = timeline.start[first:last].tolist()
+        ends = timeline.end[first:last].tolist()
+
+        painter.setPen(QColor('#2c3e50'))  # Dark border
+        metrics = painter.fontMetrics()
+        for row, start, end in zip(rows, starts, ends):
+            if row == IDLE:
+                continue
+            x = self.x_at(start)
+            width = (end - start) * self.pixels_per_unit
+            block = QRectF(x + 1, top + 2, max(1.0, width - 2), max(1.0, self.lane_height - 4))
+
+            # Same color for every slice of a process
+            painter.setBrush(self.colors[row % len(self.colors)])
+            painter.drawRoundedRect(block, min(10.0, width / 4), min(10.0, self.lane_height / 4))
+
+            # Center the Process ID when it fits
+            text = f"P{self._pids[row]}"
+            if metrics.horizontalAdvance(text) + 4 < width and metrics.height() < self.lane_height:
+                painter.drawText(block, Qt.AlignCenter, text)
+
+    def _paint_buckets(self, painter, rect, lane):
+        # Level of detail: one bar per bucket of pixels, colored by the process
+        # running at the bucket's midpoint and as tall as the bucket's busy share
+        timeline = self.schedule.timelines[lane]
+        bottom = (lane + 1) * self.lane_height
+        left = rect.left() - rect.left() % self.bucket_pixels
+        edges_x = np.arange(left, rect.right() + self.bucket_pixels + 1, self.bucket_pixels)
+        edges = np.clip((self.horizontalScrollBar().value() + edges_x) / self.pixels_per_unit,
+                        0, self.total_time())
+        busy = self._busy_until(lane, edges)
+        share = np.diff(busy) / np.maximum(np.diff(edges), 1e-9)
+
+        middle = (edges[:-1] + edges[1:]) / 2
+        index = np.clip(np.searchsorted(timeline.start, middle, side="right") - 1, 0, len(timeline) - 1)
+        rows = timeline.row[index]
+
+        painter.setPen(Qt.NoPen)
+        for x, row, fraction in zip(edges_x[:-1].tolist(), rows.tolist(), share.tolist()):
+            if fraction <= 0:
+                continue
+            height = max(1.0, fraction * (self.lane_height - 4))
+            color = self.colors[row % len(self.colors)] if row != IDLE else QColor('#95a5a6')
+            painter.fillRect(QRectF(x, bottom - 2 - height, self.bucket_pixels, height), color)
+
+    def _busy_until(self, lane, times):
+        # Busy (non-idle) time in [0, t) for each t, from the busy prefix sums
+        timeline = self.schedule.timelines[lane]
+        index = np.clip(np.searchsorted(timeline.start, times, side="right") - 1, 0, len(timeline) - 1)
+        partial = np.clip(times - timeline.start[index], 0, timeline.end[index] - timeline.start[index])
+        partial = np.where(timeline.row[index] != IDLE, partial, 0)
+        return timeline.busy_before[index] + partial
+
+    def _paint_axis(self, painter, rect, begin, end):
+        # Time labels at a "nice" step at least 60 pixels apart
+        step = 1
+        while step * self.pixels_per_unit < 60:
+            for factor in (2, 5, 10):
+                if step * factor * self.pixels_per_unit >= 60 or factor == 10:
+                    step = step * factor
+                    break
+        painter.setPen(QColor('#2c3e50'))
+        axis = self.lane_height * len(self.schedule.timelines)
+        tick = int(begin // step) * step
+        while tick <= end:
+            x = self.x_at(tick)
+            if x >= rect.left() - 60:
+                painter.drawLine(int(x), axis, int(x), axis + 5)
+                painter.drawText(int(x) + 2, axis + 20, str(tick))
+            tick += step
+
+    def _paint_cursor(self, painter, rect):
+        # Dim what hasn't been played yet and draw the cursor line
+        x = self.x_at(self.cursor)
+        if x <= rect.right():
+            left = max(rect.left(), int(x))
+            painter.fillRect(QRect(left, rect.top(), rect.right() - left + 1, rect.height()), self.unplayed_color)
+        painter.setPen(self.cursor_color)
+        painter.drawLine(int(x), 0, int(x), self.lane_height * len(self.schedule.timelines) + 5)
+
+    def _paint_lane_labels(self, painter):
+        # "CPU n" at the left edge of each lane, when there are several
+        lanes = len(self.schedule.timelines)
+        if lanes == 1 or painter.fontMetrics().height() > self.lane_height:
+            return
+        painter.setPen(QColor('#2c3e50'))
+        for lane in range(lanes):
+            painter.drawText(QRectF(4, lane * self.lane_height, 60, self.lane_height),
+                             Qt.AlignLeft | Qt.AlignVCenter, f"CPU {lane}")
@@ -1,22 +1,73 @@
+import itertools
+
+import numpy as np
+
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QLabel,
     QPushButton, QVBoxLayout, QWidget,
     QHBoxLayout, QTableWidget, QTableWidgetItem, QMessageBox,
-    QComboBox, QInputDialog
+    QComboBox, QInputDialog, QProgressBar, QDialog, QCheckBox,
+    QTableView, QHeaderView, QFileDialog, QShortcut, QSpinBox
 )
-from PyQt5.QtGui import QPixmap, QPainter, QColor
-from PyQt5.QtCore import Qt, QTimer
-from scheduler import fcfs, sjf_non_preemptive, priority_non_preemptive, round_robin
-from process import Process
-from scheduler import fcfs, sjf_non_preemptive, priority_non_preemptive, round_robin, mlfq
+from PyQt5.QtGui import QColor, QKeySequence
+import instrumentation
+from cache import ScheduleCache
+from incremental import INCREMENTAL_ALGORITHMS, IncrementalSchedule
+from multicore import multicore
+from scheduler import read_trace, write_trace
+from gantt import GanttChart
+from playback import Playback
+from process_model import ProcessTableModel
+from workload_io import read_workload
+from worker import Worker
+from comparison import DEFAULT_RUNS, compare_algorithms
+from sweep import sweep
+
+# Combo box label -> scheduler.ALGORITHMS name
+ALGORITHM_NAMES = {
+    "First-Come-First-Served (FCFS)": "fcfs",
+    "Shortest Job First (SJF)": "sjf_non_preemptive",
+    "Priority Scheduling": "priority_non_preemptive",
+    "Shortest Remaining Time First (SRTF)": "srtf",
+    "Preemptive Priority": "priority_preemptive",
+    "Round Robin": "round_robin",
+    "Multilevel Feedback Queue": "mlfq",
+}
+
+# Balancing combo box label -> multicore.BALANCE_POLICIES name
+BALANCE_NAMES = {
+    "Global Queue": "global",
+    "Least Loaded": "least_loaded",
+    "Work Stealing": "work_stealing",
+}
+
+# Playback speed combo box label -> Playback.speed
+PLAYBACK_SPEEDS = {
+    "0.5x": 0.5, "1x": 1, "2x": 2, "5x": 5, "10x": 10,
+    "100x": 100, "1000x": 1000, "10000x": 10000,
+}
+
+COMPLETION_ORDER_SHOWN = 50  # PIDs listed in the metrics report
+
+# Parameter grids used by the "Parameter Sweep" button
+SWEEP_GRIDS = {
+    "round_robin": {"time_quantum": range(1, 21)},
+    "mlfq": {"q1": range(1, 11), "q2": range(2, 21, 2)},
+}
 
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
 
-        self.timer = None
-        self.is_paused = False
+        self.playback = Playback(self)  # frame-paced replay of the last schedule
+        self.worker = None  # Worker of the run in progress
+        self.stopping_workers = set()  # finished workers whose threads are still winding down
+        self.cache = ScheduleCache()  # results of earlier runs, keyed by table contents
+        self.live = None  # IncrementalSchedule while "Live Update" is on
+        self.live_building = False  # its first schedule is being built on the worker
+        self.live_stale = False  # the table changed while it was being built
+        self.live_rows = np.zeros(0, dtype=bool)  # per table row: is it complete and scheduled?
         self.scheduled_processes = []
         self.current_index = 0
         self.elapsed_time = 0
@@ -34,9 +85,16 @@ class MainWindow(QMainWindow):
         central_widget.setLayout(main_layout)
 
         # --- Process Table ---
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["PID", "Arrival Time", "Burst Time", "Priority"])
+        # Columns live in NumPy arrays; the view only asks for visible cells
+        self.process_model = ProcessTableModel(self)
+        self.process_model.dataChanged.connect(self.table_edited)
+        self.process_model.modelReset.connect(self.start_live_update)
+        self.process_model.rejected.connect(self.statusBar().showMessage)
+        self.table = QTableView()
+        self.table.setModel(self.process_model)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        QShortcut(QKeySequence.Paste, self.table, self.paste_processes)
 
         main_layout.addWidget(self.table)
 
@@ -44,9 +102,32 @@ class MainWindow(QMainWindow):
         button_layout = QHBoxLayout()
 
         self.algorithm_combo = QComboBox()
-        self.algorithm_combo.addItems(["First-Come-First-Served (FCFS)", "Shortest Job First (SJF)", "Priority Scheduling", "Round Robin", "Multilevel Feedback Queue"])
+        self.algorithm_combo.addItems(list(ALGORITHM_NAMES))
+        self.algorithm_combo.currentTextChanged.connect(self.start_live_update)
         button_layout.addWidget(self.algorithm_combo)
 
+        # Reschedule as the table is edited (non-preemptive algorithms)
+        self.live_check = QCheckBox("Live Update")
+        self.live_check.toggled.connect(self.start_live_update)
+        button_layout.addWidget(self.live_check)
+
+        # Number of CPUs and, with more than one, how work is spread over them
+        button_layout.addWidget(QLabel("CPUs:"))
+        self.cores_spin = QSpinBox()
+        self.cores_spin.setRange(1, 64)
+        self.cores_spin.valueChanged.connect(lambda cores: self.balance_combo.setEnabled(cores > 1))
+        button_layout.addWidget(self.cores_spin)
+
+        self.balance_combo = QComboBox()
+        self.balance_combo.addItems(list(BALANCE_NAMES))
+        self.balance_combo.setEnabled(False)
+        button_layout.addWidget(self.balance_combo)
+
+        # Scheduler counters and phase timers (instrumentation.py)
+        self.stats_check = QCheckBox("Collect Stats")
+        self.stats_check.toggled.connect(instrumentation.enable)
+        button_layout.addWidget(self.stats_check)
+
         self.time_quantum_label = QLabel("Time Quantum:")
         self.time_quantum_input = QTableWidgetItem()
 
@@ -64,9 +145,27 @@ class MainWindow(QMainWindow):
         self.delete_button = QPushButton("Delete Selected")
         self.delete_button.clicked.connect(self.delete_selected_process)
 
+        self.import_button = QPushButton("Import Workload")
+        self.import_button.clicked.connect(self.import_workload)
+
+        self.save_run_button = QPushButton("Save Run")
+        self.save_run_button.clicked.connect(self.save_run)
+
+        self.open_run_button = QPushButton("Open Run")
+        self.open_run_button.clicked.connect(self.open_run)
+
+        self.stats_button = QPushButton("Export Stats")
+        self.stats_button.clicked.connect(self.export_stats)
+
         self.start_button = QPushButton("Start Simulation")  # <-- THIS BUTTON
         self.start_button.clicked.connect(self.start_simulation) 
 
+        self.compare_button = QPushButton("Compare Algorithms")
+        self.compare_button.clicked.connect(self.run_comparison)
+
+        self.sweep_button = QPushButton("Parameter Sweep")
+        self.sweep_button.clicked.connect(self.run_sweep)
+
         self.theme_button = QPushButton("Toggle Dark/Light Mode")
         self.theme_button.clicked.connect(self.toggle_theme)
 
@@ -82,85 +181,320 @@ class MainWindow(QMainWindow):
         self.reset_button.clicked.connect(self.reset_simulation)
         self.reset_button.setEnabled(False)
 
+        # Playback speed (time units per second = 2 x speed) and idle skipping
+        self.speed_combo = QComboBox()
+        self.speed_combo.addItems(list(PLAYBACK_SPEEDS))
+        self.speed_combo.setCurrentText("1x")
+        self.speed_combo.currentTextChanged.connect(self.set_playback_speed)
+
+        self.skip_idle_check = QCheckBox("Skip Idle")
+        self.skip_idle_check.toggled.connect(self.set_skip_idle)
+
         button_layout.addWidget(self.pause_button)
         button_layout.addWidget(self.resume_button)
         button_layout.addWidget(self.reset_button)
+        button_layout.addWidget(self.speed_combo)
+        button_layout.addWidget(self.skip_idle_check)
 
         
         button_layout.addWidget(self.theme_button)
         button_layout.addWidget(self.add_button)
         button_layout.addWidget(self.delete_button)
+        button_layout.addWidget(self.import_button)
+        button_layout.addWidget(self.save_run_button)
+        button_layout.addWidget(self.open_run_button)
         button_layout.addWidget(self.start_button)
+        button_layout.addWidget(self.compare_button)
+        button_layout.addWidget(self.sweep_button)
+        button_layout.addWidget(self.stats_button)
 
         main_layout.addLayout(button_layout)
 
-        # --- Gantt Chart Placeholder ---
-        self.gantt_chart_label = QLabel()
-        self.gantt_chart_label.setFixedHeight(150)  # Set height for Gantt chart area
-        self.gantt_chart_label.setStyleSheet("background-color: white; border: 1px solid black;")
-        
-        main_layout.addWidget(self.gantt_chart_label)
+        # --- Gantt Chart (Ctrl+wheel or +/- to zoom, 0 to fit, click to seek) ---
+        self.gantt_chart = GanttChart()
+        self.gantt_chart.setStyleSheet("background-color: white; border: 1px solid black;")
+        self.gantt_chart.seek_requested.connect(self.playback.seek)
+        self.playback.moved.connect(self.show_playback_time)
+        self.playback.finished.connect(self.playback_finished)
 
-    def add_process(self):
-        row_position = self.table.rowCount()
-        self.table.insertRow(row_position)
+        main_layout.addWidget(self.gantt_chart)
+
+        # --- Scheduling progress (shown while a worker is running) ---
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.hide()
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel_simulation)
+        self.cancel_button.setEnabled(False)
+
+        self.statusBar().addPermanentWidget(self.progress_bar)
+        self.statusBar().addPermanentWidget(self.cancel_button)
 
+    def add_process(self):
         # Pre-fill PID automatically
-        self.table.setItem(row_position, 0, QTableWidgetItem(str(row_position + 1)))
+        row_position = self.process_model.append_row()
+        self.live_rows = np.append(self.live_rows, False)
+        self.table.scrollToBottom()
+        self.table.setCurrentIndex(self.process_model.index(row_position, 1))
 
     def delete_selected_process(self):
-        selected = self.table.currentRow()
+        selected = self.table.currentIndex().row()
         if selected >= 0:
-            self.table.removeRow(selected)
- 
-    def start_simulation(self):
-        process_list = []
+            self.live_stale = self.live_stale or self.live_building
+            if self.live is not None and self.live_rows[selected]:
+                self.live.remove(self.live_position(selected))
+            self.live_rows = np.delete(self.live_rows, selected)
+            self.process_model.removeRows(selected, 1)
+            self.show_live_schedule()
+
+    def paste_processes(self):
+        # Ctrl+V: paste tab/comma separated rows at the current cell
+        current = self.table.currentIndex()
+        row, column = (current.row(), current.column()) if current.isValid() else (0, 0)
+        if self.process_model.paste(QApplication.clipboard().text(), row, column):
+            self.statusBar().showMessage(f"{self.process_model.rowCount()} processes")
+
+    def import_workload(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Workload", "",
+                                              "Workloads (*.csv *.json *.jsonl);;All Files (*)")
+        if not path:
+            return
+        try:
+            table = read_workload(path)
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, "Warning", f"Could not import workload: {error}")
+            return
+        self.process_model.set_table(table)
+        self.statusBar().showMessage(f"Imported {len(table)} processes")
 
-        for row in range(self.table.rowCount()):
-            try:
-                pid = int(self.table.item(row, 0).text())
-                arrival_time = int(self.table.item(row, 1).text())
-                burst_time = int(self.table.item(row, 2).text())
-                priority = int(self.table.item(row, 3).text())
-            except AttributeError:
-                QMessageBox.warning(self, "Warning", "Please fill all fields!")
-                return
-            except ValueError:
-                QMessageBox.warning(self, "Warning", "Invalid number format!")
-                return
+    def save_run(self):
+        # Archive the schedule on display as a binary trace (scheduler.write_trace)
+        if not self.scheduled_processes:
+            QMessageBox.warning(self, "Warning", "Run a simulation first")
+            return
+        path, chosen = QFileDialog.getSaveFileName(self, "Save Run", "run.trace",
+                                                   "Schedule Trace (*.trace);;Compressed Schedule Trace (*.trace)")
+        if not path:
+            return
+        try:
+            write_trace(self.scheduled_processes, path, compress=chosen.startswith("Compressed"))
+        except OSError as error:
+            QMessageBox.warning(self, "Warning", f"Could not save run: {error}")
+            return
+        self.statusBar().showMessage(f"Run saved to {path}")
 
-            process = Process(pid, arrival_time, burst_time, priority)
-            process_list.append(process)
+    def open_run(self):
+        # Show a saved run; the trace is memory-mapped, not loaded
+        path, _ = QFileDialog.getOpenFileName(self, "Open Run", "", "Schedule Traces (*.trace);;All Files (*)")
+        if not path:
+            return
 
-        self.suggest_algorithm(process_list)
+        def job(progress):
+            schedule = read_trace(path)
+            return schedule, schedule.summary() if len(schedule) else None
 
-        selected_algorithm = self.algorithm_combo.currentText()
+        self.run_in_worker(job, self.simulation_ready, f"Opening {path}...")
 
-        if selected_algorithm == "First-Come-First-Served (FCFS)":
-            scheduled_processes = fcfs(process_list)
-        elif selected_algorithm == "Shortest Job First (SJF)":
-            scheduled_processes = sjf_non_preemptive(process_list)
-        elif selected_algorithm == "Priority Scheduling":
-            scheduled_processes = priority_non_preemptive(process_list)
-        elif selected_algorithm == "Round Robin":
-            time_quantum, ok = self.get_time_quantum()
-            if not ok:
-                return
-            scheduled_processes = round_robin(process_list, time_quantum)
-        elif selected_algorithm == "Multilevel Feedback Queue":
-            scheduled_processes = mlfq(process_list)
+    def export_stats(self):
+        # Counters and phase times collected since the last export, as JSON or
+        # as a speedscope profile of the phases
+        path, chosen = QFileDialog.getSaveFileName(self, "Export Stats", "stats.json",
+                                                   "Stats JSON (*.json);;Speedscope Profile (*.speedscope.json)")
+        if not path:
+            return
+        try:
+            if "speedscope" in chosen or path.endswith(".speedscope.json"):
+                instrumentation.write_speedscope(path)
+            else:
+                instrumentation.write_json(path)
+        except OSError as error:
+            QMessageBox.warning(self, "Warning", f"Could not export stats: {error}")
+            return
+        instrumentation.reset()
+        self.statusBar().showMessage(f"Stats written to {path}")
+
+    def live_position(self, row):
+        # Position of a table row among the rows being scheduled
+        return int(np.count_nonzero(self.live_rows[:row]))
+
+    def start_live_update(self):
+        # The first schedule is a full run, so it is built on the worker;
+        # only the later edits are applied here, incrementally
+        self.live = None
+        self.live_rows = self.process_model.complete_rows()
+        if self.live_building:
+            self.live_stale = True  # restarted with the new settings once built
+            return
+        if not self.live_check.isChecked():
+            return
+        algorithm = ALGORITHM_NAMES[self.algorithm_combo.currentText()]
+        if algorithm not in INCREMENTAL_ALGORITHMS:
+            self.statusBar().showMessage("Live Update works with FCFS, SJF and Priority Scheduling")
+            return
+        if self.worker is not None:
+            self.live_check.setChecked(False)
+            self.statusBar().showMessage("Live Update is off while another run is in progress")
+            return
+        workload = self.process_model.table(self.live_rows)
 
-        else:
-            QMessageBox.warning(self, "Warning", "Unknown Algorithm Selected!")
+        def job(progress):
+            return IncrementalSchedule(algorithm, workload, progress)
+
+        self.reset_simulation()  # the live schedule takes over the chart
+        self.live_building = self.run_in_worker(job, self.live_ready, "Scheduling for Live Update...")
+
+    def live_ready(self, live):
+        stale = self.live_stale
+        self.simulation_finished()
+        if stale:
+            self.start_live_update()
             return
+        self.live = live
+        self.show_live_schedule()
 
+    def table_edited(self, top_left, bottom_right):
+        if self.live_building:
+            self.live_stale = True
+            return
+        if self.live is None:
+            return
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self.reschedule_row(row)
+        self.show_live_schedule()
+
+    def reschedule_row(self, row):
+        spec = self.process_model.spec(row)
+        position = self.live_position(row)
+        if spec is not None:
+            values = (spec.pid, spec.arrival_time, spec.burst_time, spec.priority)
+            if self.live_rows[row]:
+                self.live.update(position, *values)
+            else:
+                self.live.insert(position, *values)
+        elif self.live_rows[row]:
+            self.live.remove(position)
+        self.live_rows[row] = spec is not None
+
+    def show_live_schedule(self):
+        if self.live is None:
+            return
+        schedule = self.live.schedule
+        self.draw_gantt_chart(schedule)
+        if not len(schedule):
+            self.statusBar().showMessage("Live: no complete processes")
+            return
+        metrics = schedule.table.summary()
+        self.statusBar().showMessage(
+            f"Live: Avg Waiting {metrics['average_waiting_time']:.2f}, "
+            f"Avg Turnaround {metrics['average_turnaround_time']:.2f}, "
+            f"CPU Utilization {metrics['cpu_utilization']:.2f} % "
+            f"({self.live.recomputed} of {len(schedule)} dispatches recomputed)")
+ 
+    def read_processes(self):
+        # The model validates cells as they are edited, so only blanks are left to check
+        if not self.process_model.complete_rows().all():
+            QMessageBox.warning(self, "Warning", "Please fill all fields!")
+            return None
+        with instrumentation.phase("parse"):
+            return self.process_model.table()
+
+    def start_simulation(self):
+        process_list = self.read_processes()
+        if process_list is None:
+            return
+
+        algorithm, params = ALGORITHM_NAMES[self.algorithm_combo.currentText()], {}
+        if algorithm == "round_robin":
+            time_quantum, ok = self.get_time_quantum()
+            if not ok:
+                return
+            params = {"time_quantum": time_quantum}
+        elif algorithm == "mlfq":
+            quanta, ok = self.get_mlfq_quanta()
+            if not ok:
+                return
+            params = {"q1": quanta[0], "q2": quanta[1]}
+
+        cores = self.cores_spin.value()
+        balance = BALANCE_NAMES[self.balance_combo.currentText()]
+
+        # Scheduling and metrics run on a worker thread; results come back
+        # through simulation_ready. Unchanged table + algorithm hits the cache.
+        def job(progress):
+            if cores == 1:
+                scheduled_processes = self.cache.schedule(process_list, algorithm, params, progress)
+            else:
+                scheduled_processes = multicore(process_list, algorithm, cores, balance, progress, **params)
+            metrics = scheduled_processes.summary() if len(scheduled_processes) else None
+            return scheduled_processes, metrics
+
+        self.run_in_worker(job, self.simulation_ready, "Scheduling...")
+
+    def worker_buttons(self):
+        # Buttons that start a worker, disabled while one is running
+        return (self.start_button, self.compare_button, self.sweep_button, self.open_run_button,
+                self.import_button)
+
+    def run_in_worker(self, job, on_ready, message):
+        # One run at a time; returns False (and starts nothing) while busy
+        if self.worker is not None:
+            self.statusBar().showMessage("Busy: wait for the current run to finish or cancel it")
+            return False
+        self.worker = Worker(job)
+        self.worker.progress.connect(self.show_progress)
+        self.worker.finished.connect(on_ready)
+        self.worker.failed.connect(self.simulation_failed)
+        self.worker.cancelled.connect(self.simulation_cancelled)
+
+        for button in self.worker_buttons():
+            button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.statusBar().showMessage(message)
+        self.worker.start()
+        return True
+
+    def show_progress(self, done, total):
+        self.progress_bar.setValue(int(done * 100 / total) if total else 100)
+
+    def cancel_simulation(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_button.setEnabled(False)
+
+    def simulation_finished(self):
+        # The job has reported back; keep its worker until the thread stops
+        # (dropping a running QThread aborts), without blocking on it
+        worker, self.worker = self.worker, None
+        self.live_building = self.live_stale = False
+        if worker is not None:
+            self.stopping_workers.add(worker)
+            worker.thread.finished.connect(lambda: self.stopping_workers.discard(worker))
+            if not worker.is_running():
+                self.stopping_workers.discard(worker)
+        for button in self.worker_buttons():
+            button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.progress_bar.hide()
+
+    def simulation_cancelled(self):
+        self.simulation_finished()
+        self.statusBar().showMessage("Simulation cancelled")
+
+    def simulation_failed(self, message):
+        self.simulation_finished()
+        self.statusBar().clearMessage()
+        QMessageBox.warning(self, "Warning", f"Simulation failed: {message}")
+
+    def simulation_ready(self, result):
+        self.simulation_finished()
+        self.statusBar().clearMessage()
+        scheduled_processes, metrics = result
 
-        print("\nScheduled Processes (after FCFS):")
-        for p in scheduled_processes:
-            print(f"PID: {p.pid}, Start: {p.start_time}, Finish: {p.finish_time}, Waiting: {p.waiting_time}, Turnaround: {p.turnaround_time}")
-        
         self.draw_gantt_chart(scheduled_processes)
-       
+
         # Prepare for Simulation Control
         self.scheduled_processes = scheduled_processes
         self.current_index = 0
@@ -170,69 +504,21 @@ class MainWindow(QMainWindow):
         self.resume_button.setEnabled(False)
         self.reset_button.setEnabled(True)
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.run_simulation_step)
-        self.timer.start(500)  # 0.5 second = one time unit
-
-        self.show_performance_metrics(scheduled_processes)
-
-        # For now just print to console
-        print("\nProcesses Loaded:")
-        for p in process_list:
-            print(p)
-
-    def draw_gantt_chart(self, process_list):
-        if not process_list:
-            return
-
-        width_per_unit = 30  # Pixels per unit time
-        chart_height = 100
-        label_height = 30
-        total_time = process_list[-1].finish_time
-        width = max(600, total_time * width_per_unit)
-
-        pixmap = QPixmap(width, chart_height + label_height)
-        pixmap.fill(QColor('#f0f0f0'))  # Light background
-
-        painter = QPainter(pixmap)
-        font = painter.font()
-        font.setPointSize(10)
-        font.setBold(True)
-        painter.setFont(font)
-
-        # Colors (improved modern colors)
-        colors = [QColor('#3498db'), QColor('#2ecc71'), QColor('#e74c3c'),
-                QColor('#9b59b6'), QColor('#f1c40f'), QColor('#e67e22'), QColor('#1abc9c')]
-
-        x = 0
-
-        for i, process in enumerate(process_list):
-            process_width = (process.finish_time - process.start_time) * width_per_unit
-
-            # Draw block with rounded rectangle
-            painter.setBrush(colors[i % len(colors)])
-            painter.setPen(QColor('#2c3e50'))  # Dark border
-            painter.drawRoundedRect(x + 2, 2, process_width - 4, chart_height - 4, 10, 10)
-
-            # Center the Process ID in the middle
-            text = f"P{process.pid}"
-            text_rect = painter.boundingRect(x, 0, process_width, chart_height, 0, text)
-            painter.drawText(text_rect, Qt.AlignCenter, text)
-
-            # Draw start time at the bottom
-            start_time_text = str(process.start_time)
-            painter.drawText(x, chart_height + 20, start_time_text)
-
-            x += process_width
+        self.playback.start(scheduled_processes)
 
-        # Draw final finish time
-        painter.drawText(x, chart_height + 20, str(process_list[-1].finish_time))
+        self.show_performance_metrics(scheduled_processes, metrics)
 
-        painter.end()
-
-        # Set pixmap to label
-        self.gantt_chart_label.setPixmap(pixmap)
+    def closeEvent(self, event):
+        # Don't leave a scheduling thread running behind a closed window
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+        for worker in list(self.stopping_workers):
+            worker.wait()
+        super().closeEvent(event)
 
+    def draw_gantt_chart(self, schedule):
+        self.gantt_chart.set_schedule(schedule)
 
     def get_time_quantum(self):
         text, ok = QInputDialog.getText(self, 'Time Quantum', 'Enter Time Quantum:')
@@ -247,20 +533,40 @@ class MainWindow(QMainWindow):
                 return None, False
         return None, False
 
-    def show_performance_metrics(self, scheduled_processes):
+    def get_mlfq_quanta(self):
+        text, ok = QInputDialog.getText(self, 'MLFQ Quanta', 'Enter Queue 1 and Queue 2 quanta (q1,q2):', text='4,8')
+        if ok:
+            try:
+                q1, q2 = (int(value) for value in text.split(','))
+                if q1 <= 0 or q2 <= 0:
+                    raise ValueError
+                return (q1, q2), True
+            except ValueError:
+                QMessageBox.warning(self, "Warning", "Invalid MLFQ Quanta!")
+                return None, False
+        return None, False
+
+    def show_performance_metrics(self, scheduled_processes, metrics=None):
         if not scheduled_processes:
             return
 
-        total_waiting_time = sum(p.waiting_time for p in scheduled_processes)
-        total_turnaround_time = sum(p.turnaround_time for p in scheduled_processes)
-        total_burst_time = sum(p.burst_time for p in scheduled_processes)
-        total_processes = len(scheduled_processes)
-        total_time_span = scheduled_processes[-1].finish_time - min(p.arrival_time for p in scheduled_processes)
-
-        average_waiting_time = total_waiting_time / total_processes
-        average_turnaround_time = total_turnaround_time / total_processes
-        cpu_utilization = (total_burst_time / total_time_span) * 100
-        throughput = total_processes / total_time_span
+        if metrics is None:
+            metrics = scheduled_processes.summary()
+        average_waiting_time = metrics["average_waiting_time"]
+        average_turnaround_time = metrics["average_turnaround_time"]
+        average_response_time = metrics["average_response_time"]
+        cpu_utilization = metrics["cpu_utilization"]
+        throughput = metrics["throughput"]
+        makespan = metrics["makespan"]
+        # The first few only: saved runs may hold millions of processes
+        completion_order = ", ".join(f"P{pid}" for pid in scheduled_processes.table.pid[:COMPLETION_ORDER_SHOWN].tolist())
+        if len(scheduled_processes) > COMPLETION_ORDER_SHOWN:
+            completion_order += f", ... ({len(scheduled_processes)} processes)"
+        percentiles = "\n".join(
+            f"{label} Time: p50 {metrics[f'p50_{name}']:.0f}, p95 {metrics[f'p95_{name}']:.0f}, "
+            f"p99 {metrics[f'p99_{name}']:.0f}, max {metrics[f'max_{name}']} units"
+            for label, name in (("Waiting", "waiting_time"), ("Turnaround", "turnaround_time"),
+                                ("Response", "response_time")))
 
         report = f"""
 
@@ -269,10 +575,16 @@ class MainWindow(QMainWindow):
 
 Average Waiting Time: {average_waiting_time:.2f} units
 Average Turnaround Time: {average_turnaround_time:.2f} units
+Average Response Time: {average_response_time:.2f} units
+{percentiles}
+Makespan: {makespan} units
 CPU Utilization: {cpu_utilization:.2f} %
 Throughput: {throughput:.2f} processes/unit time
-Completion Order: {', '.join('P'+str(p.pid) for p in scheduled_processes)}
+Completion Order: {completion_order}
         """
+        if "core_utilization" in metrics:
+            report = report.rstrip() + "\nPer-CPU Utilization: " + ", ".join(
+                f"CPU {core}: {value:.1f} %" for core, value in enumerate(metrics["core_utilization"]))
 
         QMessageBox.information(self, "Performance Metrics", report)
 
@@ -288,60 +600,162 @@ Completion Order: {', '.join('P'+str(p.pid) for p in scheduled_processes)}
             with open("styles.qss", "r") as f:
                 self.parent().setStyleSheet(f.read()) if self.parent() else self.setStyleSheet(f.read())
 
-    def suggest_algorithm(self, process_list):
-        short_tasks = sum(1 for p in process_list if p.burst_time <= 3)
-        long_wait_expected = any(p.priority > 5 for p in process_list)
-        mixed_tasks = any(p.burst_time >= 8 for p in process_list) and any(p.burst_time <= 3 for p in process_list)
-
-        suggestion = "Suggestion:\n"
+    def run_comparison(self):
+        process_list = self.read_processes()
+        if process_list is None:
+            return
+        if not process_list:
+            QMessageBox.warning(self, "Warning", "Add processes to compare!")
+            return
 
-        if short_tasks >= len(process_list) // 2:
-            suggestion += "- Many short tasks detected. Recommended: SJF (Shortest Job First)\n"
+        # Round Robin needs a quantum; the other algorithms use their defaults
+        time_quantum, ok = self.get_time_quantum()
+        if not ok:
+            return
+        runs = [(name, dict(params, time_quantum=time_quantum) if name == "round_robin" else params)
+                for name, params in DEFAULT_RUNS]
 
-        if long_wait_expected:
-            suggestion += "- Interactive tasks with long wait times detected. Recommended: Priority Scheduling\n"
+        def job(progress):
+            return compare_algorithms(process_list, runs, progress=progress, cache=self.cache)
 
-        if mixed_tasks:
-            suggestion += "- Mixture of I/O-bound and CPU-bound tasks detected. Recommended: Multilevel Feedback Queue (MLFQ)\n"
+        self.run_in_worker(job, self.show_comparison, "Comparing algorithms...")
 
-        if suggestion.strip() != "Suggestion:":
-            QMessageBox.information(self, "Algorithm Suggestion", suggestion)
-        else:
-            QMessageBox.information(self, "Algorithm Suggestion", "No specific suggestion. Default algorithms can be used.")
-
-    def run_simulation_step(self):
-        if self.is_paused or self.current_index >= len(self.scheduled_processes):
-            if self.current_index >= len(self.scheduled_processes):
-                self.timer.stop()
-                self.pause_button.setEnabled(False)
-                self.resume_button.setEnabled(False)
+    def run_sweep(self):
+        # Sweep the selected algorithm's parameters over a default grid
+        selected_algorithm = ALGORITHM_NAMES[self.algorithm_combo.currentText()]
+        if selected_algorithm not in SWEEP_GRIDS:
+            QMessageBox.warning(self, "Warning", "Select Round Robin or Multilevel Feedback Queue to sweep!")
+            return
+        process_list = self.read_processes()
+        if process_list is None:
+            return
+        if not process_list:
+            QMessageBox.warning(self, "Warning", "Add processes to sweep!")
             return
 
-        process = self.scheduled_processes[self.current_index]
+        def job(progress):
+            return sweep(process_list, selected_algorithm, SWEEP_GRIDS[selected_algorithm], progress=progress,
+                         cache=self.cache)
+
+        self.run_in_worker(job, self.show_sweep, "Sweeping parameters...")
+
+    def show_sweep(self, result):
+        self.simulation_finished()
+        self.statusBar().clearMessage()
+
+        # One row per value of the first parameter, one column per value of the second
+        axes = list(result.axes.items())
+        matrix = result.matrix().reshape(len(axes[0][1]), -1)
+        row_name, row_values = axes[0]
+        column_name, column_values = axes[1] if len(axes) > 1 else (result.metric, [""])
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Parameter Sweep (average waiting time)")
+        layout = QVBoxLayout(dialog)
+        best = ", ".join(f"{name}={value}" for name, value in result.best["params"].items())
+        layout.addWidget(QLabel(f"Best setting: {best} "
+                                f"(average waiting time {result.best[result.metric]:.2f})"))
+
+        table = QTableWidget(matrix.shape[0], matrix.shape[1])
+        table.setVerticalHeaderLabels([f"{row_name}={value}" for value in row_values])
+        table.setHorizontalHeaderLabels([f"{column_name}={value}" if value != "" else column_name
+                                         for value in column_values])
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        for i, j in itertools.product(range(matrix.shape[0]), range(matrix.shape[1])):
+            item = QTableWidgetItem(f"{matrix[i, j]:.2f}")
+            if matrix[i, j] == result.best[result.metric]:
+                item.setBackground(QColor('#2ecc71'))
+            table.setItem(i, j, item)
+        table.resizeColumnsToContents()
+        layout.addWidget(table)
+        dialog.resize(900, 500)
+        dialog.exec_()
+
+    def show_comparison(self, rows):
+        self.simulation_finished()
+        self.statusBar().clearMessage()
+
+        names = {name: label for label, name in ALGORITHM_NAMES.items()}
+        headers = ["Rank", "Algorithm", "Avg Waiting", "Avg Turnaround", "Avg Response",
+                   "Throughput", "Wall-clock (ms)"]
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Algorithm Comparison (ranked by average waiting time)")
+        layout = QVBoxLayout(dialog)
+        table = QTableWidget(len(rows), len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        for i, row in enumerate(rows):
+            values = [
+                str(row["rank"]),
+                names.get(row["algorithm"], row["algorithm"]),
+                f"{row['average_waiting_time']:.2f}",
+                f"{row['average_turnaround_time']:.2f}",
+                f"{row['average_response_time']:.2f}",
+                f"{row['throughput']:.4f}",
+                f"{row['wall_clock_seconds'] * 1000:.1f}",
+            ]
+            for column, value in enumerate(values):
+                table.setItem(i, column, QTableWidgetItem(value))
+        table.resizeColumnsToContents()
+        layout.addWidget(table)
+        dialog.resize(900, 300)
+        dialog.exec_()
+
+    def show_playback_time(self, position):
+        # Playback moved: advance the chart cursor every frame, the status bar
+        # once per time unit
+        self.gantt_chart.set_cursor(position)
+        schedule = self.scheduled_processes if self.scheduled_processes else None
+        if schedule is None:
+            return
+        time = int(position)
+        if time == self.elapsed_time and self.statusBar().currentMessage():
+            return
+        self.elapsed_time = time
+        if time >= schedule.end_time:
+            self.statusBar().showMessage(f"Time {time}: Finished")
+            return
 
-        if self.elapsed_time >= process.start_time and self.elapsed_time < process.finish_time:
-            self.elapsed_time += 1
-            # Update Gantt chart dynamically (Optional if you implemented dynamic drawing)
+        # Index of the timeline slice being played
+        self.current_index = schedule.timeline.index_at(time)
+        if schedule.cores == 1:
+            pid = schedule.running_at(time)
+            self.statusBar().showMessage(f"Time {time}: " + ("Idle" if pid is None else f"Running P{pid}"))
         else:
-            self.current_index += 1
+            running = ", ".join(f"CPU {core}: " + ("Idle" if pid is None else f"P{pid}")
+                                for core, pid in enumerate(schedule.running_on(time)))
+            self.statusBar().showMessage(f"Time {time}: {running}")
+
+    def playback_finished(self):
+        self.pause_button.setEnabled(False)
+        self.resume_button.setEnabled(True)
+
+    def set_playback_speed(self, text):
+        self.playback.speed = PLAYBACK_SPEEDS[text]
+
+    def set_skip_idle(self, skip):
+        self.playback.skip_idle = skip
+        if skip:
+            self.playback.seek(self.playback.position)
 
     def pause_simulation(self):
-        if self.timer:
-            self.is_paused = True
+        if self.playback.schedule is not None:
+            self.playback.pause()
             self.pause_button.setEnabled(False)
             self.resume_button.setEnabled(True)
 
     def resume_simulation(self):
-        if self.timer:
-            self.is_paused = False
+        if self.playback.schedule is not None:
+            if self.playback.position >= self.playback.schedule.end_time:
+                self.playback.seek(0)  # replay from the start
+            self.playback.resume()
             self.pause_button.setEnabled(True)
             self.resume_button.setEnabled(False)
 
     def reset_simulation(self):
-        if self.timer:
-            self.timer.stop()
+        self.playback.stop()
 
-        self.is_paused = False
         self.scheduled_processes = []
         self.current_index = 0
         self.elapsed_time = 0
@@ -351,5 +765,6 @@ Completion Order: {', '.join('P'+str(p.pid) for p in scheduled_processes)}
         self.reset_button.setEnabled(False)
 
         # Optionally clear Gantt chart
-        self.gantt_chart_label.clear()
+        self.gantt_chart.clear()
+        self.statusBar().clearMessage()
         
\ No newline at end of file
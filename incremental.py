@@ -0,0 +1,218 @@
+import heapq
+
+import numpy as np
+
+from process import ProcessTable
+from scheduler import ALGORITHMS, _completed
+
+# Incremental rescheduling for the non-preemptive algorithms. A dispatch at
+# time t only depends on the processes that have arrived by t, so after an
+# edit every dispatch before the first affected point in time is kept and the
+# scheduler resumes from there. Resumption stops early as soon as the new run
+# reaches the state of the old one (same clock, same set of dispatched
+# processes): from then on the old schedule is reused as it is.
+#
+# Rows are positions in the workload, as in the GUI table; inserting or
+# removing a row renumbers the rows after it.
+
+# Algorithm name -> heap key column (None: arrival order)
+INCREMENTAL_ALGORITHMS = {
+    "fcfs": None,
+    "sjf_non_preemptive": "burst_time",
+    "priority_non_preemptive": "priority",
+}
+
+_GHOST = -1  # old dispatch of a removed or edited row
+
+
+class IncrementalSchedule:
+    def __init__(self, algorithm, workload=(), progress=None):
+        if algorithm not in INCREMENTAL_ALGORITHMS:
+            raise ValueError(f"{algorithm} cannot be rescheduled incrementally")
+        if not isinstance(workload, ProcessTable):
+            workload = ProcessTable.from_processes(list(workload))
+        self.algorithm = algorithm
+        self.key_column = INCREMENTAL_ALGORITHMS[algorithm]
+        self.pid = np.array(workload.pid)
+        self.arrival_time = np.array(workload.arrival_time)
+        self.burst_time = np.array(workload.burst_time)
+        self.priority = np.array(workload.priority)
+        self.recomputed = len(workload)  # dispatches recomputed by the last edit
+
+        schedule = ALGORITHMS[algorithm](workload, progress=progress)
+        self.sequence = np.array(schedule.order, dtype=np.int64)  # rows in dispatch order
+        self.start_time = np.array(schedule.table.start_time)  # start of each dispatch
+        self.by_arrival = np.lexsort((np.arange(len(workload)), self._keys(), self.arrival_time))
+        self._schedule = schedule
+
+    def __len__(self):
+        return len(self.pid)
+
+    def _keys(self):
+        if self.key_column is None:
+            return np.zeros(len(self.pid), dtype=np.int64)
+        return getattr(self, self.key_column)
+
+    def _key(self, row):
+        return 0 if self.key_column is None else int(getattr(self, self.key_column)[row])
+
+    @property
+    def schedule(self):
+        if self._schedule is None:
+            table = ProcessTable(self.pid.copy(), self.arrival_time.copy(), self.burst_time.copy(),
+                                 self.priority.copy())
+            self._schedule = _completed(table, self.sequence, self.start_time)
+        return self._schedule
+
+    # --- Edits ---
+
+    def insert(self, row, pid, arrival_time, burst_time, priority=0):
+        self.pid = np.insert(self.pid, row, pid)
+        self.arrival_time = np.insert(self.arrival_time, row, arrival_time)
+        self.burst_time = np.insert(self.burst_time, row, burst_time)
+        self.priority = np.insert(self.priority, row, priority)
+        self.sequence[self.sequence >= row] += 1
+        self.by_arrival[self.by_arrival >= row] += 1
+        self._sort_in(row)
+        # Nothing dispatched before the new arrival can change
+        self._resume(arrival_time, fresh=row)
+
+    def append(self, pid, arrival_time, burst_time, priority=0):
+        self.insert(len(self), pid, arrival_time, burst_time, priority)
+
+    def remove(self, row):
+        position = self._position(row)
+        cut = int(self.start_time[position])
+        self.sequence[position] = _GHOST
+        self.pid = np.delete(self.pid, row)
+        self.arrival_time = np.delete(self.arrival_time, row)
+        self.burst_time = np.delete(self.burst_time, row)
+        self.priority = np.delete(self.priority, row)
+        self.sequence[self.sequence > row] -= 1
+        self.by_arrival = np.delete(self.by_arrival, np.flatnonzero(self.by_arrival == row))
+        self.by_arrival[self.by_arrival > row] -= 1
+        # The removed process never ran before its own dispatch
+        self._resume(cut, ghost=True)
+
+    def update(self, row, pid, arrival_time, burst_time, priority=0):
+        old = (int(self.arrival_time[row]), int(self.burst_time[row]), int(self.priority[row]))
+        self.pid = self.pid.copy()
+        self.pid[row] = pid
+        if old == (arrival_time, burst_time, priority):
+            self.recomputed = 0
+            self._schedule = None
+            return
+
+        position = self._position(row)
+        cut = min(int(self.start_time[position]), arrival_time)
+        self.sequence[position] = _GHOST
+        self.by_arrival = np.delete(self.by_arrival, np.flatnonzero(self.by_arrival == row))
+        for name, value in zip(("arrival_time", "burst_time", "priority"), (arrival_time, burst_time, priority)):
+            column = getattr(self, name).copy()
+            column[row] = value
+            setattr(self, name, column)
+        self._sort_in(row)
+        self._resume(cut, fresh=row, ghost=True)
+
+    def _position(self, row):
+        return int(np.flatnonzero(self.sequence == row)[0])
+
+    def _sort_in(self, row):
+        # Insert `row` into by_arrival, ordered by (arrival, key, row)
+        arrival = self.arrival_time[self.by_arrival]
+        low = int(np.searchsorted(arrival, self.arrival_time[row], side="left"))
+        high = int(np.searchsorted(arrival, self.arrival_time[row], side="right"))
+        ties = self.by_arrival[low:high]
+        keys = self._keys()[ties]
+        key = self._key(row)
+        position = low + int(np.count_nonzero((keys < key) | ((keys == key) & (ties < row))))
+        self.by_arrival = np.insert(self.by_arrival, position, row)
+
+    # --- Resumption ---
+
+    def _resume(self, cut, fresh=None, ghost=False):
+        # Keep the dispatches starting before `cut` and reschedule the rest.
+        # `fresh` is a row the old schedule never saw, `ghost` marks an old
+        # dispatch that no longer exists.
+        self._schedule = None
+        kept = int(np.searchsorted(self.start_time, cut, side="left"))
+        if kept:
+            last = self.sequence[kept - 1]
+            current_time = int(self.start_time[kept - 1] + self.burst_time[last])
+        else:
+            current_time = 0
+        dispatched = np.zeros(len(self), dtype=bool)
+        dispatched[self.sequence[:kept]] = True
+        pending = self.by_arrival[~dispatched[self.by_arrival]]
+
+        if self.key_column is None:
+            rows, starts = self._resume_fcfs(pending, current_time)
+            old = len(self.sequence)
+        else:
+            rows, starts, old = self._resume_heap(pending, current_time, kept, fresh, ghost)
+        self.recomputed = len(rows)
+        self.sequence = np.concatenate((self.sequence[:kept], rows, self.sequence[old:]))
+        self.start_time = np.concatenate((self.start_time[:kept], starts, self.start_time[old:]))
+
+    def _resume_fcfs(self, pending, current_time):
+        # FCFS dispatches in arrival order, so the tail is one vectorized pass
+        # (see scheduler.fcfs) starting from the clock at the cut
+        arrival = self.arrival_time[pending]
+        burst = self.burst_time[pending]
+        work_done = np.cumsum(burst)
+        idle = np.maximum.accumulate(np.maximum(arrival - (current_time + work_done - burst), 0)) \
+            if len(pending) else burst
+        return pending, current_time + work_done + idle - burst
+
+    def _resume_heap(self, pending, current_time, kept, fresh, ghost):
+        # Same dispatch rule as scheduler._non_preemptive_core, with heap
+        # entries (key, arrival, row) matching the batch tie-breaking
+        arrival = self.arrival_time
+        burst = self.burst_time
+        keys = self._keys()
+        old_rows = self.sequence
+        old_starts = self.start_time
+        old = kept
+        difference = set()  # rows dispatched by only one of the two runs
+
+        def passed(entry):
+            nonlocal ghost
+            if entry == _GHOST:
+                ghost = False
+            elif entry in difference:
+                difference.remove(entry)
+            else:
+                difference.add(entry)
+
+        ready_queue = []
+        rows = []
+        starts = []
+        upcoming = 0
+        while upcoming < len(pending) or ready_queue:
+            while upcoming < len(pending) and arrival.item(pending.item(upcoming)) <= current_time:
+                row = pending.item(upcoming)
+                heapq.heappush(ready_queue, (keys.item(row), arrival.item(row), row))
+                upcoming += 1
+            if not ready_queue:
+                current_time = arrival.item(pending.item(upcoming))
+                continue
+
+            # Old run caught up: same clock and same processes left
+            while old < len(old_rows) and old_starts.item(old) < current_time:
+                passed(old_rows.item(old))
+                old += 1
+            if (old < len(old_rows) and old_starts.item(old) == current_time
+                    and not difference and fresh is None and not ghost):
+                return np.array(rows, dtype=np.int64), np.array(starts, dtype=np.int64), old
+
+            row = heapq.heappop(ready_queue)[2]
+            rows.append(row)
+            starts.append(current_time)
+            current_time += burst.item(row)
+            if row == fresh:
+                fresh = None
+            elif row in difference:
+                difference.remove(row)
+            else:
+                difference.add(row)
+        return np.array(rows, dtype=np.int64), np.array(starts, dtype=np.int64), len(old_rows)
@@ -0,0 +1,185 @@
+import cProfile
+import contextlib
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from timeline import IDLE
+
+# Runtime-switchable counters and phase timers, off by default. When off,
+# every hook is one check of `enabled`, made once per run or per phase and
+# never inside a scheduler loop: the run counters are derived from what a
+# core reports (completions and execution slices) after it returns.
+#
+# Counters: runs, processes, dispatches, context_switches, queue_pushes,
+# queue_pops, sorts, idle_jumps. Phases: parse, schedule, metrics, render
+# (wall-clock seconds; nested phases are included in their parent).
+
+MAX_EVENTS = 1_000_000  # phase open/close events kept for speedscope, per thread
+
+enabled = False
+counters = Counter()
+phases = defaultdict(lambda: [0.0, 0])  # name -> [seconds, calls]
+_events = defaultdict(list)  # thread name -> [(kind, phase, time)]
+_lock = threading.Lock()
+_started = time.perf_counter()
+_profiler = None
+
+
+def enable(on=True, profile=False):
+    # Switch collection on or off; with profile=True the calling thread is
+    # also profiled with cProfile until disable()
+    global enabled, _profiler
+    enabled = on
+    if on and profile and _profiler is None:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    elif not on and _profiler is not None:
+        _profiler.disable()
+
+
+def disable():
+    enable(False)
+
+
+def reset():
+    global _started, _profiler
+    with _lock:
+        counters.clear()
+        phases.clear()
+        _events.clear()
+        _started = time.perf_counter()
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler = None
+
+
+def count(name, amount=1):
+    if enabled:
+        with _lock:
+            counters[name] += amount
+
+
+class _Phase:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        _log("O", self.name, self.started)
+        return self
+
+    def __exit__(self, *exc_info):
+        ended = time.perf_counter()
+        with _lock:
+            totals = phases[self.name]
+            totals[0] += ended - self.started
+            totals[1] += 1
+        _log("C", self.name, ended)
+
+
+_NO_PHASE = contextlib.nullcontext()
+
+
+def phase(name):
+    # Context manager timing one phase: `with instrumentation.phase("parse"):`
+    return _Phase(name) if enabled else _NO_PHASE
+
+
+def _log(kind, name, at):
+    # Under the lock: a thread's first event adds its list to _events, which
+    # the exports iterate
+    with _lock:
+        events = _events[threading.current_thread().name]
+        if len(events) < MAX_EVENTS:
+            events.append((kind, name, at))
+
+
+def record_run(completions, dispatches, timelines=()):
+    # Counters of one scheduler run. `dispatches` is the number of execution
+    # slices handed out (one per process for non-preemptive cores); every
+    # dispatch pops the ready queue and every admission or requeue pushes
+    # it, which adds up to the same number. Context switches and idle jumps
+    # are read off the timelines.
+    if not enabled:
+        return
+    switches = idle_jumps = 0
+    for timeline in timelines:
+        busy = timeline.row[timeline.row != IDLE]
+        switches += int(np.count_nonzero(busy[1:] != busy[:-1]))
+        idle_jumps += int(np.count_nonzero(timeline.row == IDLE))
+    with _lock:
+        counters["runs"] += 1
+        counters["processes"] += completions
+        counters["dispatches"] += dispatches
+        counters["context_switches"] += switches
+        counters["idle_jumps"] += idle_jumps
+        counters["queue_pushes"] += dispatches
+        counters["queue_pops"] += dispatches
+
+
+# --- Export ---
+
+def snapshot():
+    with _lock:
+        return {
+            "enabled": enabled,
+            "counters": dict(counters),
+            "phases": {name: {"seconds": seconds, "calls": calls} for name, (seconds, calls) in phases.items()},
+        }
+
+
+def write_json(path):
+    with open(path, "w") as f:
+        json.dump(snapshot(), f, indent=2)
+
+
+def write_speedscope(path):
+    # Phase timings as a speedscope (https://www.speedscope.app) evented
+    # profile, one per thread
+    profiles = []
+    with _lock:
+        names = sorted({name for events in _events.values() for _, name, _ in events})
+        index = {name: i for i, name in enumerate(names)}
+        for thread, events in _events.items():
+            if not events:
+                continue
+            # Drop unclosed phases so the profile stays balanced
+            closes = Counter(name for kind, name, _ in events if kind == "C")
+            balanced = []
+            for kind, name, at in events:
+                if kind == "O" and not closes[name]:
+                    continue
+                if kind == "O":
+                    closes[name] -= 1
+                balanced.append({"type": kind, "frame": index[name], "at": (at - _started) * 1000})
+            if not balanced:
+                continue
+            profiles.append({
+                "type": "evented", "name": thread, "unit": "milliseconds",
+                "startValue": balanced[0]["at"], "endValue": balanced[-1]["at"], "events": balanced,
+            })
+    data = {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": [{"name": name} for name in names]},
+        "profiles": profiles,
+        "name": "scheduler phases",
+        "exporter": "instrumentation.py",
+    }
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def write_profile(path):
+    # cProfile statistics of the profiled thread, for pstats / snakeviz
+    if _profiler is None:
+        raise RuntimeError("profiling was not enabled (use enable(profile=True))")
+    _profiler.disable()
+    _profiler.dump_stats(path)
+    if enabled:
+        _profiler.enable()
@@ -0,0 +1,141 @@
+import math
+
+import numpy as np
+
+# Summary metrics computed in one pass over completed processes, either one
+# at a time as a scheduler reports them (streaming runs) or a column chunk
+# at a time (batch schedules). Batch, GUI and streaming runs all summarize
+# through MetricsAccumulator, so they report the same figures.
+
+QUANTILES = (50, 95, 99)
+TIMES = ("waiting_time", "turnaround_time", "response_time")
+
+# Keys of MetricsAccumulator.summary(), in order
+SUMMARY_METRICS = (
+    tuple(f"average_{name}" for name in TIMES)
+    + ("cpu_utilization", "throughput", "makespan")
+    + tuple(f"{field}_{name}" for name in TIMES for field in ("max",) + tuple(f"p{q}" for q in QUANTILES))
+)
+
+
+class QuantileSketch:
+    # Bounded-memory quantiles of non-negative integers. Values below
+    # `exact_limit` are counted exactly; larger ones go to logarithmic buckets
+    # (as in DDSketch) and come back within `relative_accuracy` of the true
+    # value. Memory is exact_limit counters plus at most a few thousand
+    # buckets over the whole int64 range, however many values are added.
+    def __init__(self, relative_accuracy=0.01, exact_limit=1024):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.exact_limit = exact_limit
+        self.exact = np.zeros(exact_limit, dtype=np.int64)
+        self.buckets = {}  # bucket index -> count
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value < self.exact_limit:
+            self.exact[max(value, 0)] += 1
+        else:
+            bucket = math.ceil(math.log(value) / self.log_gamma)
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def add_array(self, values):
+        values = np.asarray(values)
+        self.count += len(values)
+        small = values < self.exact_limit
+        self.exact += np.bincount(np.maximum(values[small], 0), minlength=self.exact_limit)
+        large = values[~small]
+        if len(large):
+            keys, counts = np.unique(np.ceil(np.log(large) / self.log_gamma).astype(np.int64),
+                                     return_counts=True)
+            for bucket, count in zip(keys.tolist(), counts.tolist()):
+                self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+    def quantile(self, q):
+        # Nearest-rank quantile: the smallest value with at least q * count
+        # values at or below it (q in [0, 1])
+        if not self.count:
+            return None
+        rank = max(0, math.ceil(q * self.count) - 1)
+        exact_total = int(self.exact.sum())
+        if rank < exact_total:
+            return float(np.searchsorted(np.cumsum(self.exact), rank, side="right"))
+        rank -= exact_total
+        for bucket in sorted(self.buckets):
+            rank -= self.buckets[bucket]
+            if rank < 0:
+                # Midpoint of the bucket (gamma^(k-1), gamma^k] in relative terms
+                return max(float(self.exact_limit), 2 * self.gamma ** bucket / (self.gamma + 1))
+        return None
+
+
+class MetricsAccumulator:
+    # Running totals, maxima and quantile sketches of the waiting,
+    # turnaround and response times, plus the span from the first arrival to
+    # the last finish (the makespan, whatever the completion order)
+    def __init__(self):
+        self.count = 0
+        self.totals = dict.fromkeys(TIMES, 0)
+        self.maxima = dict.fromkeys(TIMES, 0)
+        self.sketches = {name: QuantileSketch() for name in TIMES}
+        self.total_burst_time = 0
+        self.first_arrival = None
+        self.last_finish = None
+
+    def add(self, arrival_time, burst_time, start_time, finish_time):
+        # One completed process
+        turnaround = finish_time - arrival_time
+        for name, value in (("waiting_time", turnaround - burst_time), ("turnaround_time", turnaround),
+                            ("response_time", start_time - arrival_time)):
+            self.totals[name] += value
+            if value > self.maxima[name]:
+                self.maxima[name] = value
+            self.sketches[name].add(value)
+        self.count += 1
+        self.total_burst_time += burst_time
+        if self.first_arrival is None or arrival_time < self.first_arrival:
+            self.first_arrival = arrival_time
+        if self.last_finish is None or finish_time > self.last_finish:
+            self.last_finish = finish_time
+
+    def add_columns(self, arrival_time, burst_time, start_time, finish_time):
+        # A chunk of completed processes as equal-length int64 columns
+        if not len(arrival_time):
+            return
+        turnaround = finish_time - arrival_time
+        for name, values in (("waiting_time", turnaround - burst_time), ("turnaround_time", turnaround),
+                             ("response_time", start_time - arrival_time)):
+            self.totals[name] += int(values.sum())
+            self.maxima[name] = max(self.maxima[name], int(values.max()))
+            self.sketches[name].add_array(values)
+        self.count += len(arrival_time)
+        self.total_burst_time += int(burst_time.sum())
+        first_arrival = int(arrival_time.min())
+        last_finish = int(finish_time.max())
+        if self.first_arrival is None or first_arrival < self.first_arrival:
+            self.first_arrival = first_arrival
+        if self.last_finish is None or last_finish > self.last_finish:
+            self.last_finish = last_finish
+
+    @property
+    def makespan(self):
+        return 0 if not self.count else self.last_finish - self.first_arrival
+
+    def summary(self, cores=1):
+        # Averages, maxima and p50/p95/p99 of each time, plus makespan,
+        # utilization of `cores` CPUs and throughput
+        if not self.count:
+            return {}
+        makespan = self.makespan
+        metrics = {}
+        for name in TIMES:
+            metrics[f"average_{name}"] = self.totals[name] / self.count
+        metrics["cpu_utilization"] = self.total_burst_time / (makespan * cores) * 100
+        metrics["throughput"] = self.count / makespan
+        metrics["makespan"] = makespan
+        for name in TIMES:
+            metrics[f"max_{name}"] = self.maxima[name]
+            for quantile in QUANTILES:
+                metrics[f"p{quantile}_{name}"] = self.sketches[name].quantile(quantile / 100)
+        return metrics
@@ -0,0 +1,332 @@
+import functools
+import heapq
+import inspect
+from collections import deque
+
+import instrumentation
+from scheduler import (
+    ALGORITHMS, ONLINE_ALGORITHMS, PROGRESS_INTERVAL, _arrival_order, _columns, _completed, _schedules
+)
+
+# N-CPU simulation. Each core has a ready queue with the discipline of the
+# chosen algorithm (with balance="global" all cores share one), and a single
+# event heap holds the end of every core's current slice. The clock jumps
+# from event to event, so the cost grows with the number of slices, not with
+# the number of cores.
+#
+# Balancing policies:
+#   global         one shared ready queue; idle cores take the next process
+#                  and, for preemptive algorithms, an arrival preempts the
+#                  core running the least urgent process
+#   least_loaded   each arrival joins the core with the fewest processes
+#                  (queued + running) and stays there
+#   work_stealing  arrivals are dealt to the cores in turn; a core that runs
+#                  out of work takes the next process of the longest queue
+
+BALANCE_POLICIES = ("global", "least_loaded", "work_stealing")
+
+
+class _Entry:
+    __slots__ = ("job", "key", "rank", "remaining", "first_start", "level")
+
+    def __init__(self, job, key, rank, remaining):
+        self.job = job
+        self.key = key
+        self.rank = rank  # arrival order, breaks ties
+        self.remaining = remaining
+        self.first_start = -1
+        self.level = 0  # MLFQ queue level
+
+
+class _FifoQueue:
+    # FCFS ready queue, or Round Robin with a quantum
+    preemptive = False
+
+    def __init__(self, quantum=None):
+        self.entries = deque()
+        self.quantum = quantum
+
+    def __len__(self):
+        return len(self.entries)
+
+    def push(self, entry):
+        self.entries.append(entry)
+
+    requeue = push
+
+    def pop(self):
+        return self.entries.popleft()
+
+    def slice_length(self, entry):
+        return entry.remaining if self.quantum is None else min(self.quantum, entry.remaining)
+
+
+class _HeapQueue:
+    # Ready queue ordered by key (SJF, priority) or by remaining time (SRTF);
+    # a preemptive queue takes the CPU from a strictly less urgent process
+    def __init__(self, preemptive=False, remaining_key=False):
+        self.entries = []  # heap of (key, rank, entry)
+        self.preemptive = preemptive
+        self.remaining_key = remaining_key
+
+    def __len__(self):
+        return len(self.entries)
+
+    def urgency(self, entry, remaining):
+        return (remaining if self.remaining_key else entry.key), entry.rank
+
+    def push(self, entry):
+        heapq.heappush(self.entries, self.urgency(entry, entry.remaining) + (entry,))
+
+    requeue = push
+
+    def pop(self):
+        return heapq.heappop(self.entries)[2]
+
+    def slice_length(self, entry):
+        return entry.remaining
+
+    def preempts(self, entry, remaining):
+        # Would the head of the queue preempt `entry` with `remaining` left?
+        return self.entries[0][0] < self.urgency(entry, remaining)[0]
+
+
+class _FeedbackQueue:
+    # MLFQ: quanta q1 and q2, then FCFS; a process that uses up its quantum
+    # moves down one level
+    preemptive = False
+
+    def __init__(self, q1, q2):
+        self.levels = (deque(), deque(), deque())
+        self.quanta = (q1, q2, None)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, entry):
+        self.levels[entry.level].append(entry)
+        self.size += 1
+
+    def requeue(self, entry):
+        entry.level = min(entry.level + 1, 2)
+        self.push(entry)
+
+    def pop(self):
+        self.size -= 1
+        for level in self.levels:
+            if level:
+                return level.popleft()
+
+    def slice_length(self, entry):
+        quantum = self.quanta[entry.level]
+        return entry.remaining if quantum is None else min(quantum, entry.remaining)
+
+
+def _ready_queue(algorithm, params):
+    if algorithm == "fcfs":
+        return _FifoQueue()
+    if algorithm in ("sjf_non_preemptive", "priority_non_preemptive"):
+        return _HeapQueue()
+    if algorithm == "srtf":
+        return _HeapQueue(preemptive=True, remaining_key=True)
+    if algorithm == "priority_preemptive":
+        return _HeapQueue(preemptive=True)
+    if algorithm == "round_robin":
+        return _FifoQueue(params["time_quantum"])
+    return _FeedbackQueue(params.get("q1", 4), params.get("q2", 8))
+
+
+class _Simulation:
+    # Shared event loop for all cores. At each point in time: arrivals are
+    # queued, slices ending then are closed (unfinished processes requeued
+    # behind the arrivals), idle cores are given work, and finally arrivals
+    # may preempt. With one core this reproduces the single-CPU algorithms.
+    def __init__(self, cores, balance, new_queue, completed, slices, progress=None, total=0):
+        self.cores = cores
+        self.balance = balance
+        if balance == "global":
+            self.queues = [new_queue()] * cores
+        else:
+            self.queues = [new_queue() for _ in range(cores)]
+        self.running = [None] * cores
+        self.slice_start = [0] * cores
+        self.version = [0] * cores  # bumped on preemption to void the pending slice end
+        self.events = []  # heap of (slice end, core, version)
+        # Idle cores: a heap when they share a queue (lowest core first),
+        # else a set
+        self.idle = list(range(cores)) if balance == "global" else set(range(cores))
+        self.is_idle = [True] * cores
+        self.load = [0] * cores  # queued + running processes (least_loaded)
+        self.loads = [(0, core) for core in range(cores)]  # heap of (load, core), stale entries skipped
+        self.waiting = 0  # processes in ready queues
+        self.completed = completed
+        self.slices = slices
+        self.progress = progress
+        self.total = total
+        self.done = 0
+        self.current_time = 0
+
+    def run(self, arrivals):
+        upcoming = next(arrivals, None)
+        rank = 0
+        events = self.events
+        while upcoming is not None or events:
+            if events and (upcoming is None or events[0][0] < upcoming[0]):
+                self.current_time = events[0][0]
+            else:
+                self.current_time = upcoming[0]
+
+            touched = []  # cores given new arrivals or freed at this time
+            while upcoming is not None and upcoming[0] == self.current_time:
+                entry = _Entry(upcoming[3], upcoming[2], rank, upcoming[1])
+                touched.append(self.admit(entry, rank))
+                rank += 1
+                upcoming = next(arrivals, None)
+            arrived = bool(touched)
+
+            while events and events[0][0] == self.current_time:
+                _, core, version = heapq.heappop(events)
+                if version == self.version[core]:
+                    self.end_slice(core)
+                    touched.append(core)
+
+            self.dispatch(touched)
+            if arrived and self.queues[0].preemptive and self.waiting:
+                self.preempt(touched)
+
+    def admit(self, entry, rank):
+        # Queue an arrival; returns its core
+        if self.balance == "global":
+            core = 0
+        elif self.balance == "least_loaded":
+            while self.loads[0][0] != self.load[self.loads[0][1]]:
+                heapq.heappop(self.loads)
+            core = self.loads[0][1]
+            self._add_load(core, 1)
+        else:
+            core = rank % self.cores
+        self.queues[core].push(entry)
+        self.waiting += 1
+        return core
+
+    def start(self, core, entry):
+        if entry.first_start < 0:
+            entry.first_start = self.current_time
+        self.running[core] = entry
+        self.slice_start[core] = self.current_time
+        self.is_idle[core] = False
+        if self.balance != "global":
+            self.idle.discard(core)
+        self.version[core] += 1
+        end = self.current_time + self.queues[core].slice_length(entry)
+        heapq.heappush(self.events, (end, core, self.version[core]))
+
+    def stop(self, core):
+        # Take the running process off `core` at the current time
+        entry = self.running[core]
+        entry.remaining -= self.current_time - self.slice_start[core]
+        if self.slices is not None:
+            self.slices.append((entry.job, self.slice_start[core], self.current_time, core))
+        self.running[core] = None
+        self.is_idle[core] = True
+        self.version[core] += 1
+        if self.balance == "global":
+            heapq.heappush(self.idle, core)
+        else:
+            self.idle.add(core)
+        return entry
+
+    def end_slice(self, core):
+        entry = self.stop(core)
+        if entry.remaining:
+            self.queues[core].requeue(entry)
+            self.waiting += 1
+            return
+        self.completed.append((entry.job, entry.first_start, self.current_time))
+        if self.balance == "least_loaded":
+            self._add_load(core, -1)
+        self.done += 1
+        if self.progress is not None and not self.done % PROGRESS_INTERVAL:
+            self.progress(self.done, self.total)
+
+    def _add_load(self, core, change):
+        self.load[core] += change
+        heapq.heappush(self.loads, (self.load[core], core))
+
+    def take(self, core):
+        self.waiting -= 1
+        self.start(core, self.queues[core].pop())
+
+    def dispatch(self, touched):
+        if not self.waiting:
+            return
+        if self.balance == "global":
+            while self.waiting and self.idle:
+                core = heapq.heappop(self.idle)
+                if self.is_idle[core]:
+                    self.take(core)
+            return
+
+        # Only cores touched now can be idle with work queued
+        for core in sorted(set(touched)):
+            if self.is_idle[core] and self.queues[core]:
+                self.take(core)
+        if self.balance == "work_stealing":
+            while self.waiting and self.idle:
+                victim = max(range(self.cores), key=lambda c: len(self.queues[c]))
+                self.waiting -= 1
+                self.start(min(self.idle), self.queues[victim].pop())
+
+    def preempt(self, touched):
+        if self.balance == "global":
+            # Preempt the least urgent running processes while the head of
+            # the shared queue beats them
+            queue = self.queues[0]
+            while self.waiting:
+                core = max((c for c in range(self.cores) if self._left(c) > 0),
+                           key=lambda c: queue.urgency(self.running[c], self._left(c)), default=None)
+                if core is None or not queue.preempts(self.running[core], self._left(core)):
+                    return
+                queue.requeue(self.stop(core))
+                self.waiting += 1
+                self.take(core)
+            return
+
+        for core in sorted(set(touched)):
+            queue = self.queues[core]
+            if self._left(core) > 0 and queue and queue.preempts(self.running[core], self._left(core)):
+                queue.requeue(self.stop(core))
+                self.waiting += 1
+                self.take(core)
+
+    def _left(self, core):
+        # Remaining time of the process running on `core`, 0 if idle
+        entry = self.running[core]
+        if entry is None:
+            return 0
+        return entry.remaining - (self.current_time - self.slice_start[core])
+
+
+@_schedules
+def multicore(table, algorithm, cores=4, balance="global", progress=None, **params):
+    # Schedule `table` on `cores` CPUs with the named algorithm and balancing
+    # policy; the Schedule has one timeline per core
+    if balance not in BALANCE_POLICIES:
+        raise ValueError(f"unknown balancing policy '{balance}' (choose from {', '.join(BALANCE_POLICIES)})")
+    if cores < 1:
+        raise ValueError("cores must be at least 1")
+    # Same parameters as the single-CPU algorithm
+    inspect.signature(ALGORITHMS[algorithm]).bind(table, **params)
+
+    completed = []
+    slices = []
+    new_queue = functools.partial(_ready_queue, algorithm, params)
+    simulation = _Simulation(cores, balance, new_queue, completed, slices, progress, len(table))
+    simulation.run(_arrival_order(table, ONLINE_ALGORITHMS[algorithm][1]))
+
+    completed = _columns(completed)
+    slices = _columns(slices, 4).T
+    schedule = _completed(table, completed[:, 0], completed[:, 1], completed[:, 2], slices, cores)
+    instrumentation.record_run(len(completed), slices.shape[1], schedule.timelines)
+    return schedule
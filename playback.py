@@ -0,0 +1,76 @@
+import time
+
+from PyQt5.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+
+class Playback(QObject):
+    # Plays a Schedule back against the wall clock. Every frame moves the
+    # position by the real time elapsed since the previous frame, times
+    # `units_per_second * speed`, so the pace holds whatever the frame rate
+    # and however long a repaint took. With skip_idle, stretches where all
+    # CPUs are idle are jumped over. The position is fractional; listeners
+    # get it through `moved`.
+    frame_interval = 16  # ms, about 60 frames per second
+    units_per_second = 2.0  # at speed 1
+
+    moved = pyqtSignal(float)  # new position, in time units
+    finished = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.schedule = None
+        self.position = 0.0
+        self.speed = 1.0
+        self.skip_idle = False
+        self._last_frame = 0.0
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._frame)
+
+    def is_playing(self):
+        return self.timer.isActive()
+
+    def start(self, schedule):
+        # Play `schedule` from time 0
+        self.schedule = schedule
+        self.seek(0)
+        self.resume()
+
+    def pause(self):
+        self.timer.stop()
+
+    def resume(self):
+        if self.schedule is None or self.position >= self.schedule.end_time:
+            return
+        self._last_frame = time.perf_counter()
+        self.timer.start(self.frame_interval)
+
+    def stop(self):
+        self.timer.stop()
+        self.schedule = None
+        self.position = 0.0
+
+    def seek(self, position):
+        # Jump to `position` (clamped to the schedule), playing or not
+        if self.schedule is None:
+            return
+        end_time = self.schedule.end_time
+        self.position = min(max(0.0, float(position)), float(end_time))
+        if self.skip_idle:
+            self.position = self._next_busy(self.position)
+        self.moved.emit(self.position)
+        if self.position >= end_time and self.is_playing():
+            self.timer.stop()
+            self.finished.emit()
+
+    def _frame(self):
+        now = time.perf_counter()
+        elapsed = now - self._last_frame
+        self._last_frame = now
+        self.seek(self.position + elapsed * self.units_per_second * self.speed)
+
+    def _next_busy(self, position):
+        # Earliest time from `position` on at which any CPU is busy
+        times = [timeline.next_busy(position) for timeline in self.schedule.timelines]
+        times = [t for t in times if t is not None]
+        return float(min(times)) if times else float(self.schedule.end_time)
@@ -1,3 +1,10 @@
+import numpy as np
+
+from metrics import MetricsAccumulator
+
+SUMMARY_CHUNK = 1 << 20  # rows per metrics pass
+
+
 class Process:
     def __init__(self, pid, arrival_time, burst_time, priority=0):
         self.pid = pid
@@ -13,3 +20,170 @@ class Process:
 
     def __repr__(self):
         return f"PID:{self.pid} AT:{self.arrival_time} BT:{self.burst_time} P:{self.priority}"
+
+
+class ProcessSpec:
+    # Read-only workload entry. Schedulers never write to it, so one list of
+    # specs can be scheduled many times, from several threads at once.
+    __slots__ = ("pid", "arrival_time", "burst_time", "priority")
+
+    def __init__(self, pid, arrival_time, burst_time, priority=0):
+        object.__setattr__(self, "pid", pid)
+        object.__setattr__(self, "arrival_time", arrival_time)
+        object.__setattr__(self, "burst_time", burst_time)
+        object.__setattr__(self, "priority", priority)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __reduce__(self):
+        return (ProcessSpec, (self.pid, self.arrival_time, self.burst_time, self.priority))
+
+    def __eq__(self, other):
+        if not isinstance(other, ProcessSpec):
+            return NotImplemented
+        return (self.pid, self.arrival_time, self.burst_time, self.priority) == \
+            (other.pid, other.arrival_time, other.burst_time, other.priority)
+
+    def __hash__(self):
+        return hash((self.pid, self.arrival_time, self.burst_time, self.priority))
+
+    def __repr__(self):
+        return f"PID:{self.pid} AT:{self.arrival_time} BT:{self.burst_time} P:{self.priority}"
+
+
+class ProcessResult:
+    # Outcome of one process in one scheduling run
+    __slots__ = ("pid", "arrival_time", "burst_time", "priority", "start_time",
+                 "finish_time", "waiting_time", "turnaround_time", "response_time")
+
+    def __init__(self, pid, arrival_time, burst_time, priority, start_time,
+                 finish_time, waiting_time, turnaround_time, response_time):
+        self.pid = pid
+        self.arrival_time = arrival_time
+        self.burst_time = burst_time
+        self.priority = priority
+        self.start_time = start_time
+        self.finish_time = finish_time
+        self.waiting_time = waiting_time
+        self.turnaround_time = turnaround_time
+        self.response_time = response_time
+
+    def __repr__(self):
+        return (f"PID:{self.pid} ST:{self.start_time} FT:{self.finish_time} "
+                f"WT:{self.waiting_time} TAT:{self.turnaround_time}")
+
+
+class ProcessTable:
+    # Struct-of-arrays workload: one int64 NumPy column per Process field.
+    # The workload columns are read-only views, so tables can be shared
+    # between runs; start_time / finish_time / response_time are -1 until
+    # scheduled.
+    workload_columns = ("pid", "arrival_time", "burst_time", "priority")
+    result_columns = ("start_time", "finish_time", "waiting_time", "turnaround_time", "response_time")
+
+    def __init__(self, pid, arrival_time, burst_time, priority=None):
+        if priority is None:
+            priority = np.zeros(len(pid), dtype=np.int64)
+        self.pid = _read_only(pid)
+        self.arrival_time = _read_only(arrival_time)
+        self.burst_time = _read_only(burst_time)
+        self.priority = _read_only(priority)
+
+        size = len(self.pid)
+        self.start_time = np.full(size, -1, dtype=np.int64)
+        self.finish_time = np.full(size, -1, dtype=np.int64)
+        self.waiting_time = np.zeros(size, dtype=np.int64)
+        self.turnaround_time = np.zeros(size, dtype=np.int64)
+        self.response_time = np.full(size, -1, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.pid)
+
+    def __setstate__(self, state):
+        # Unpickled arrays are writable copies; keep the workload read-only
+        self.__dict__.update(state)
+        for name in self.workload_columns:
+            setattr(self, name, _read_only(getattr(self, name)))
+
+    def __repr__(self):
+        return f"ProcessTable({len(self)} processes)"
+
+    @classmethod
+    def from_processes(cls, process_list):
+        size = len(process_list)
+        table = cls(
+            np.fromiter((p.pid for p in process_list), np.int64, size),
+            np.fromiter((p.arrival_time for p in process_list), np.int64, size),
+            np.fromiter((p.burst_time for p in process_list), np.int64, size),
+            np.fromiter((p.priority for p in process_list), np.int64, size),
+        )
+        # Carry over results if the processes have already been scheduled
+        if size and getattr(process_list[0], "finish_time", None) is not None:
+            for name in cls.result_columns:
+                column = np.fromiter(
+                    (-1 if getattr(p, name) is None else getattr(p, name) for p in process_list),
+                    np.int64, size,
+                )
+                setattr(table, name, column)
+        return table
+
+    def to_processes(self):
+        process_list = []
+        columns = [getattr(self, name).tolist() for name in self.workload_columns + self.result_columns]
+        for pid, arrival, burst, priority, start, finish, waiting, turnaround, response in zip(*columns):
+            process = Process(pid, arrival, burst, priority)
+            if finish >= 0:
+                process.start_time = start
+                process.finish_time = finish
+                process.remaining_time = 0
+                process.waiting_time = waiting
+                process.turnaround_time = turnaround
+                process.response_time = response
+            process_list.append(process)
+        return process_list
+
+    def to_specs(self):
+        columns = [getattr(self, name).tolist() for name in self.workload_columns]
+        return [ProcessSpec(*row) for row in zip(*columns)]
+
+    def to_results(self):
+        columns = [getattr(self, name).tolist() for name in self.workload_columns + self.result_columns]
+        return [ProcessResult(*row) for row in zip(*columns)]
+
+    def take(self, order):
+        # New table with the rows reordered (or selected) by an index array
+        table = ProcessTable.__new__(ProcessTable)
+        for name in self.workload_columns:
+            setattr(table, name, _read_only(getattr(self, name)[order]))
+        for name in self.result_columns:
+            setattr(table, name, getattr(self, name)[order])
+        return table
+
+    def compute_metrics(self):
+        # Derive waiting / turnaround / response from the start and finish columns
+        self.turnaround_time = self.finish_time - self.arrival_time
+        self.waiting_time = self.turnaround_time - self.burst_time
+        self.response_time = self.start_time - self.arrival_time
+        return self
+
+    def summary(self, cores=1):
+        # Aggregate metrics over a scheduled table (see metrics.py);
+        # utilization is the busy share of all `cores`
+        accumulator = MetricsAccumulator()
+        # A block of rows at a time, so memory-mapped tables aren't read whole
+        for low in range(0, len(self), SUMMARY_CHUNK):
+            high = low + SUMMARY_CHUNK
+            accumulator.add_columns(self.arrival_time[low:high], self.burst_time[low:high],
+                                    self.start_time[low:high], self.finish_time[low:high])
+        return accumulator.summary(cores)
+
+
+def _read_only(values):
+    # Read-only int64 view; the caller's own array stays writable
+    column = np.asarray(values, dtype=np.int64).view()
+    column.flags.writeable = False
+    return column
@@ -0,0 +1,168 @@
+import numpy as np
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+
+from process import ProcessSpec, ProcessTable
+
+
+class ProcessTableModel(QAbstractTableModel):
+    # Editable process list stored as one int64 NumPy column per workload
+    # field, for QTableView. Cells are parsed and validated when edited, so
+    # the columns always hold valid numbers; cells not filled in yet are
+    # flagged in `missing`. table() hands the columns to the scheduler
+    # without going through text.
+    headers = ("PID", "Arrival Time", "Burst Time", "Priority")
+    columns = ProcessTable.workload_columns
+
+    rejected = pyqtSignal(str)  # an edit or paste was refused, with the reason
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.values = np.zeros((0, len(self.columns)), dtype=np.int64)
+        self.missing = np.zeros((0, len(self.columns)), dtype=bool)
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.values)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        row, column = index.row(), index.column()
+        return "" if self.missing[row, column] else str(self.values[row, column])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section]
+        return str(section + 1)
+
+    def flags(self, index):
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        row, column = index.row(), index.column()
+        text = str(value).strip()
+        if not text:
+            self.missing[row, column] = True
+        else:
+            try:
+                number = int(np.int64(int(text)))
+            except ValueError:
+                self.rejected.emit(f"{self.headers[column]} must be a whole number")
+                return False
+            except OverflowError:
+                self.rejected.emit(f"{self.headers[column]} is too large")
+                return False
+            problem = _check(self.columns[column], np.array([number]))
+            if problem:
+                self.rejected.emit(problem)
+                return False
+            self.values[row, column] = number
+            self.missing[row, column] = False
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if count <= 0 or row < 0 or row + count > len(self.values):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        self.values = np.delete(self.values, np.s_[row:row + count], axis=0)
+        self.missing = np.delete(self.missing, np.s_[row:row + count], axis=0)
+        self.endRemoveRows()
+        return True
+
+    # --- Rows ---
+
+    def append_row(self):
+        # New empty row with the PID pre-filled
+        row = len(self.values)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.values = np.vstack((self.values, np.zeros((1, len(self.columns)), dtype=np.int64)))
+        self.missing = np.vstack((self.missing, np.ones((1, len(self.columns)), dtype=bool)))
+        self.values[row, 0] = row + 1
+        self.missing[row, 0] = False
+        self.endInsertRows()
+        return row
+
+    def complete_rows(self):
+        # Boolean mask of the rows with every cell filled in
+        return ~self.missing.any(axis=1)
+
+    def spec(self, row):
+        # ProcessSpec of a complete row, else None
+        if self.missing[row].any():
+            return None
+        return ProcessSpec(*self.values[row].tolist())
+
+    def table(self, rows=None):
+        # ProcessTable of the given rows (all by default); the columns are
+        # copied, so later edits don't reach a schedule that is running
+        values = self.values if rows is None else self.values[rows]
+        return ProcessTable(*(values[:, i].copy() for i in range(len(self.columns))))
+
+    # --- Bulk edits ---
+
+    def set_table(self, table):
+        # Replace the whole list, e.g. with a workload read from a file
+        self.beginResetModel()
+        self.values = np.column_stack([getattr(table, name) for name in self.columns]).astype(np.int64)
+        self.missing = np.zeros(self.values.shape, dtype=bool)
+        self.endResetModel()
+
+    def paste(self, text, row=0, column=0):
+        # Paste a block of tab- or comma-separated integers with its top-left
+        # cell at (row, column), adding rows as needed. A non-numeric first
+        # line is taken as a header and skipped. The paste is all or nothing.
+        lines = [line.replace(",", "\t").split("\t") for line in text.strip("\r\n").splitlines()]
+        if lines and not all(cell.strip().lstrip("-").isdigit() for cell in lines[0]):
+            lines = lines[1:]
+        if not lines:
+            return False
+        width = len(lines[0])
+        if any(len(line) != width for line in lines) or column + width > len(self.columns):
+            self.rejected.emit("Pasted rows must have the same number of cells and fit the table")
+            return False
+        try:
+            block = np.array(lines).astype(np.int64)
+        except ValueError:
+            self.rejected.emit("Pasted cells must be whole numbers")
+            return False
+        except OverflowError:
+            self.rejected.emit("Pasted cells are too large")
+            return False
+        for offset in range(width):
+            problem = _check(self.columns[column + offset], block[:, offset])
+            if problem:
+                self.rejected.emit(problem)
+                return False
+
+        self.beginResetModel()
+        end = row + len(block)
+        if end > len(self.values):
+            added = end - len(self.values)
+            new_values = np.zeros((added, len(self.columns)), dtype=np.int64)
+            new_values[:, 0] = np.arange(len(self.values), end) + 1
+            new_missing = np.ones((added, len(self.columns)), dtype=bool)
+            new_missing[:, 0] = False
+            self.values = np.vstack((self.values, new_values))
+            self.missing = np.vstack((self.missing, new_missing))
+        self.values[row:end, column:column + width] = block
+        self.missing[row:end, column:column + width] = False
+        self.endResetModel()
+        return True
+
+
+def _check(column, values):
+    # Reason the values can't go in `column`, or None
+    if column == "arrival_time" and (values < 0).any():
+        return "Arrival time must not be negative"
+    if column == "burst_time" and (values <= 0).any():
+        return "Burst time must be positive"
+    return None
@@ -1,187 +1,617 @@
-def fcfs(process_list):
-    # Sort by Arrival Time first
-    process_list.sort(key=lambda x: x.arrival_time)
-
-    current_time = 0
-    for process in process_list:
-        if current_time < process.arrival_time:
-            current_time = process.arrival_time  # CPU is idle until the process arrives
-
-        process.start_time = current_time
-        process.finish_time = current_time + process.burst_time
-        process.waiting_time = process.start_time - process.arrival_time
-        process.turnaround_time = process.finish_time - process.arrival_time
-        process.response_time = process.start_time - process.arrival_time
-
-        current_time += process.burst_time
-
-    return process_list
-
-def sjf_non_preemptive(process_list):
-    # Sort by arrival time first
-    process_list.sort(key=lambda x: (x.arrival_time, x.burst_time))
-
-    completed = []
-    ready_queue = []
-    current_time = 0
-    processes = process_list.copy()
-
-    while processes or ready_queue:
-        # Move all processes that have arrived to ready_queue
-        while processes and processes[0].arrival_time <= current_time:
-            ready_queue.append(processes.pop(0))
-        
-        if ready_queue:
-            # Sort ready_queue by burst_time (Shortest Job First)
-            ready_queue.sort(key=lambda x: x.burst_time)
-            current_process = ready_queue.pop(0)
-
-            current_process.start_time = current_time
-            current_process.finish_time = current_time + current_process.burst_time
-            current_process.waiting_time = current_process.start_time - current_process.arrival_time
-            current_process.turnaround_time = current_process.finish_time - current_process.arrival_time
-            current_process.response_time = current_process.start_time - current_process.arrival_time
-
-            completed.append(current_process)
-            current_time = current_process.finish_time
+import functools
+import heapq
+import inspect
+import itertools
+import struct
+import tempfile
+import zlib
+from collections import deque
+
+import numpy as np
+
+import instrumentation
+from process import ProcessTable
+from timeline import IDLE, Timeline
+
+# Every algorithm takes a list of processes (ProcessSpec, Process or anything
+# with pid / arrival_time / burst_time / priority) or a ProcessTable and
+# returns a Schedule. The input is never modified.
+#
+# An optional `progress(done, total)` callback is called every
+# PROGRESS_INTERVAL completions; raising SchedulingCancelled from it stops
+# the run.
+
+PROGRESS_INTERVAL = 4096
+
+
+class SchedulingCancelled(Exception):
+    pass
+
+
+class Schedule:
+    # Result of one scheduling run: `table` holds the processes in completion
+    # order, `timeline` the execution slices (rows index `table`) and `order`
+    # the input row of each completed process. Iterating a Schedule yields
+    # ProcessResult records. Multi-CPU runs have one timeline per core in
+    # `timelines`; `timeline` is the first.
+    def __init__(self, table, timeline, order, timelines=None):
+        self.table = table
+        self.timeline = timeline
+        self.order = order
+        self.timelines = [timeline] if timelines is None else timelines
+        self._results = None
+
+    def results(self):
+        if self._results is None:
+            self._results = self.table.to_results()
+        return self._results
+
+    def __len__(self):
+        return len(self.table)
+
+    def __iter__(self):
+        return iter(self.results())
+
+    def __getitem__(self, index):
+        return self.results()[index]
+
+    def __repr__(self):
+        return f"Schedule({len(self)} processes, {len(self.timeline)} slices)"
+
+    @property
+    def cores(self):
+        return len(self.timelines)
+
+    @property
+    def end_time(self):
+        return max(timeline.end_time for timeline in self.timelines)
+
+    def running_at(self, time):
+        # PID running at `time`, or None when the CPU is idle
+        row = self.timeline.running_at(time)
+        if row is None or row == IDLE:
+            return None
+        return int(self.table.pid[row])
+
+    def running_on(self, time):
+        # PID running on each core at `time` (None where idle)
+        rows = [timeline.running_at(time) for timeline in self.timelines]
+        return [None if row is None or row == IDLE else int(self.table.pid[row]) for row in rows]
+
+    def summary(self):
+        # table.summary() over all cores, plus the busy share of each core
+        with instrumentation.phase("metrics"):
+            metrics = self.table.summary(self.cores)
+            if self.cores > 1:
+                span = metrics["makespan"]
+                metrics["core_utilization"] = [
+                    float(timeline.busy_before[-1]) / span * 100
+                    for timeline in self.timelines
+                ]
+        return metrics
+
+
+def _schedules(core):
+    @functools.wraps(core)
+    def algorithm(process_list, *args, **kwargs):
+        if not isinstance(process_list, ProcessTable):
+            process_list = ProcessTable.from_processes(process_list)
+        with instrumentation.phase("schedule"):
+            return core(process_list, *args, **kwargs)
+    return algorithm
+
+
+def _completed(table, order, start_time, finish_time=None, slices=None, cores=1):
+    # Build the Schedule from the completion order (row indices), the first
+    # start / finish time of each completed row and the execution slices as
+    # (rows, starts, ends), plus the core of each slice when cores > 1;
+    # non-preemptive runs have one slice per process
+    order = np.array(order, dtype=np.int64)
+    result = table.take(order)
+    result.start_time = np.array(start_time, dtype=np.int64)
+    if finish_time is None:
+        result.finish_time = result.start_time + result.burst_time
+    else:
+        result.finish_time = np.array(finish_time, dtype=np.int64)
+
+    if slices is None:
+        timelines = [Timeline.from_slices(np.arange(len(order)), result.start_time, result.finish_time)]
+    else:
+        # Slices refer to input rows; point them at rows of the result table
+        position = np.empty(len(table), dtype=np.int64)
+        position[order] = np.arange(len(order))
+        if cores == 1:
+            timelines = [Timeline.from_slices(*slices[:3]).relabel(position)]
         else:
-            # CPU is idle, jump to next process arrival
-            if processes:
-                current_time = processes[0].arrival_time
-
-    return completed
+            # Group the slices by core, keeping each core's in time order
+            by_core = np.argsort(slices[3], kind="stable")
+            instrumentation.count("sorts")
+            bounds = np.searchsorted(slices[3][by_core], np.arange(cores + 1))
+            timelines = [Timeline.from_slices(*slices[:3, by_core[low:high]]).relabel(position)
+                         for low, high in zip(bounds[:-1], bounds[1:])]
+    return Schedule(result.compute_metrics(), timelines[0], order, timelines)
 
 
-def priority_non_preemptive(process_list):
-    # Sort by arrival time first
-    process_list.sort(key=lambda x: (x.arrival_time, x.priority))
+@_schedules
+def fcfs(table, progress=None):
+    if progress is not None:
+        progress(0, len(table))
 
-    completed = []
-    ready_queue = []
+    # Sort by Arrival Time first
+    order = np.argsort(table.arrival_time, kind="stable")
+    instrumentation.count("sorts")
+    result = table.take(order)
+
+    # finish[i] = max(arrival[i], finish[i-1]) + burst[i], unrolled into
+    # cumulative sums: the CPU is idle whenever an arrival is later than the
+    # total work queued before it.
+    work_done = np.cumsum(result.burst_time)
+    idle = np.maximum.accumulate(np.maximum(result.arrival_time - (work_done - result.burst_time), 0))
+    result.finish_time = work_done + idle
+    result.start_time = result.finish_time - result.burst_time
+    timeline = Timeline.from_slices(np.arange(len(order)), result.start_time, result.finish_time)
+    if progress is not None:
+        progress(len(table), len(table))
+    # Computed in place, but counted as the queue-based core counts a
+    # streamed FCFS run: one push, pop and dispatch per process
+    instrumentation.record_run(len(table), len(table), [timeline])
+    return Schedule(result.compute_metrics(), timeline, order)
+
+
+# The cores below are shared by the batch algorithms and the streaming driver
+# in streaming.py. A core reads `arrivals`, an iterator of
+# (arrival_time, burst_time, key, job) tuples in arrival order, and appends
+# (job, first_start, finish) to `completed` as processes finish. Every core
+# also appends (job, start, end) execution slices to `slices` unless it is
+# None (batch runs of the non-preemptive algorithms pass None and rebuild
+# their one slice per process from `completed`). `job` is opaque to the core: a row index for batch runs, the
+# ProcessSpec itself when streaming.
+#
+# Cores are generators. With events=True they yield (kind, time, job) as the
+# simulated clock passes each DISPATCH, PREEMPT (quantum expiry included)
+# and COMPLETE, and do no more work than the consumer asks for; otherwise
+# they yield nothing and run to the end on the first next() (_run_to_end).
+
+DISPATCH = "dispatch"
+PREEMPT = "preempt"
+COMPLETE = "complete"
+
+
+def _run_to_end(core_run):
+    for _ in core_run:
+        pass
+
+
+class _Discard:
+    # `completed` of an event run: the events carry the results
+    def append(self, item):
+        pass
+
+
+def schedule_events(process_list, algorithm, **params):
+    # Lazy run of the named algorithm: a generator of (kind, time, row) events
+    # in clock order, `row` being the process's index in `process_list`.
+    # Nothing is simulated ahead of the consumer, so a run can be paused
+    # between next() calls, resumed later, or stopped early with close().
+    if not isinstance(process_list, ProcessTable):
+        process_list = ProcessTable.from_processes(process_list)
+    inspect.signature(ALGORITHMS[algorithm]).bind(process_list, **params)
+    core, key = ONLINE_ALGORITHMS[algorithm]
+    return core(_arrival_order(process_list, key), _Discard(), events=True, **params)
+
+
+def _non_preemptive_core(arrivals, completed, slices=None, progress=None, total=0, events=False):
+    ready_queue = []  # heap of (key, arrival rank, arrival tuple)
     current_time = 0
-    processes = process_list.copy()
+    admitted = 0
+    done = 0
+    upcoming = next(arrivals, None)
 
-    while processes or ready_queue:
+    while upcoming is not None or ready_queue:
         # Move all processes that have arrived to ready_queue
-        while processes and processes[0].arrival_time <= current_time:
-            ready_queue.append(processes.pop(0))
-        
+        while upcoming is not None and upcoming[0] <= current_time:
+            heapq.heappush(ready_queue, (upcoming[2], admitted, upcoming))
+            admitted += 1
+            upcoming = next(arrivals, None)
+
         if ready_queue:
-            # Sort ready_queue by priority (lower number = higher priority)
-            ready_queue.sort(key=lambda x: x.priority)
-            current_process = ready_queue.pop(0)
-
-            current_process.start_time = current_time
-            current_process.finish_time = current_time + current_process.burst_time
-            current_process.waiting_time = current_process.start_time - current_process.arrival_time
-            current_process.turnaround_time = current_process.finish_time - current_process.arrival_time
-            current_process.response_time = current_process.start_time - current_process.arrival_time
-
-            completed.append(current_process)
-            current_time = current_process.finish_time
+            burst, job = heapq.heappop(ready_queue)[2][1::2]
+            if events:
+                yield DISPATCH, current_time, job
+            completed.append((job, current_time, current_time + burst))
+            if slices is not None:
+                slices.append((job, current_time, current_time + burst))
+            current_time += burst
+            if events:
+                yield COMPLETE, current_time, job
+            done += 1
+            if progress is not None and not done % PROGRESS_INTERVAL:
+                progress(done, total)
         else:
             # CPU is idle, jump to next process arrival
-            if processes:
-                current_time = processes[0].arrival_time
-
-    return completed
+            current_time = upcoming[0]
 
-def round_robin(process_list, time_quantum):
-    process_list.sort(key=lambda x: x.arrival_time)
 
-    ready_queue = []
-    completed = []
+def _round_robin_core(arrivals, completed, slices=None, progress=None, total=0, time_quantum=None,
+                      events=False):
+    ready_queue = deque()  # of [remaining, first_start, job]
     current_time = 0
-    processes = process_list.copy()
+    done = 0
+    upcoming = next(arrivals, None)
 
-    while processes or ready_queue:
+    while upcoming is not None or ready_queue:
         # Move all processes that have arrived to ready_queue
-        while processes and processes[0].arrival_time <= current_time:
-            ready_queue.append(processes.pop(0))
+        while upcoming is not None and upcoming[0] <= current_time:
+            ready_queue.append([upcoming[1], -1, upcoming[3]])
+            upcoming = next(arrivals, None)
 
         if ready_queue:
-            current_process = ready_queue.pop(0)
+            entry = ready_queue.popleft()
 
-            if current_process.start_time is None:
-                current_process.start_time = current_time
-                current_process.response_time = current_time - current_process.arrival_time
+            if entry[1] < 0:
+                entry[1] = current_time
 
-            execute_time = min(time_quantum, current_process.remaining_time)
+            if ready_queue:
+                execute_time = min(time_quantum, entry[0])
+            elif upcoming is not None:
+                # Only runnable process: run whole quanta until the next arrival can be queued
+                quanta = max(1, -(-(upcoming[0] - current_time) // time_quantum))
+                execute_time = min(quanta * time_quantum, entry[0])
+            else:
+                execute_time = entry[0]
+            if events:
+                yield DISPATCH, current_time, entry[2]
+            if slices is not None:
+                slices.append((entry[2], current_time, current_time + execute_time))
             current_time += execute_time
-            current_process.remaining_time -= execute_time
+            entry[0] -= execute_time
+            if events:
+                yield (COMPLETE if entry[0] == 0 else PREEMPT), current_time, entry[2]
 
             # Move newly arrived processes into ready_queue during execution
-            while processes and processes[0].arrival_time <= current_time:
-                ready_queue.append(processes.pop(0))
-
-            if current_process.remaining_time == 0:
-                current_process.finish_time = current_time
-                current_process.turnaround_time = current_process.finish_time - current_process.arrival_time
-                current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
-                completed.append(current_process)
+            while upcoming is not None and upcoming[0] <= current_time:
+                ready_queue.append([upcoming[1], -1, upcoming[3]])
+                upcoming = next(arrivals, None)
+
+            if entry[0] == 0:
+                completed.append((entry[2], entry[1], current_time))
+                done += 1
+                if progress is not None and not done % PROGRESS_INTERVAL:
+                    progress(done, total)
             else:
                 # If not finished, put it back to end of ready_queue
-                ready_queue.append(current_process)
+                ready_queue.append(entry)
         else:
-            if processes:
-                current_time = processes[0].arrival_time
-
-    return completed
+            current_time = upcoming[0]
 
 
-def mlfq(process_list, q1=4, q2=8):
-    process_list.sort(key=lambda x: x.arrival_time)
-
-    completed = []
-    queue1 = []
-    queue2 = []
-    queue3 = []
-
+def _mlfq_core(arrivals, completed, slices=None, progress=None, total=0, q1=4, q2=8, events=False):
+    queues = (deque(), deque(), deque())  # of [remaining, first_start, job]
+    quanta = (q1, q2, None)  # Lowest queue is FCFS, no quantum
     current_time = 0
-    processes = process_list.copy()
+    done = 0
+    upcoming = next(arrivals, None)
 
-    while processes or queue1 or queue2 or queue3:
+    while upcoming is not None or queues[0] or queues[1] or queues[2]:
         # Move newly arrived processes to queue1
-        while processes and processes[0].arrival_time <= current_time:
-            queue1.append(processes.pop(0))
-
-        if queue1:
-            current_process = queue1.pop(0)
-            execute_time = min(q1, current_process.remaining_time)
-        elif queue2:
-            current_process = queue2.pop(0)
-            execute_time = min(q2, current_process.remaining_time)
-        elif queue3:
-            current_process = queue3.pop(0)
-            execute_time = current_process.remaining_time  # FCFS no quantum
+        while upcoming is not None and upcoming[0] <= current_time:
+            queues[0].append([upcoming[1], -1, upcoming[3]])
+            upcoming = next(arrivals, None)
+
+        # Level of the queue the next process is taken from
+        if queues[0]:
+            level = 0
+        elif queues[1]:
+            level = 1
+        elif queues[2]:
+            level = 2
         else:
-            if processes:
-                current_time = processes[0].arrival_time
+            current_time = upcoming[0]
             continue
 
-        if current_process.start_time is None:
-            current_process.start_time = current_time
-            current_process.response_time = current_time - current_process.arrival_time
+        entry = queues[level].popleft()
+        if quanta[level] is None:
+            execute_time = entry[0]
+        else:
+            execute_time = min(quanta[level], entry[0])
 
+        if entry[1] < 0:
+            entry[1] = current_time
+
+        if events:
+            yield DISPATCH, current_time, entry[2]
+        if slices is not None:
+            slices.append((entry[2], current_time, current_time + execute_time))
         current_time += execute_time
-        current_process.remaining_time -= execute_time
+        entry[0] -= execute_time
+        if events:
+            yield (COMPLETE if entry[0] == 0 else PREEMPT), current_time, entry[2]
 
         # Move new arrivals during execution
-        while processes and processes[0].arrival_time <= current_time:
-            queue1.append(processes.pop(0))
-
-        if current_process.remaining_time == 0:
-            current_process.finish_time = current_time
-            current_process.turnaround_time = current_process.finish_time - current_process.arrival_time
-            current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
-            completed.append(current_process)
+        while upcoming is not None and upcoming[0] <= current_time:
+            queues[0].append([upcoming[1], -1, upcoming[3]])
+            upcoming = next(arrivals, None)
+
+        if entry[0] == 0:
+            completed.append((entry[2], entry[1], current_time))
+            done += 1
+            if progress is not None and not done % PROGRESS_INTERVAL:
+                progress(done, total)
         else:
-            # Move to lower queue
-            if current_process in queue1:
-                queue2.append(current_process)
-            elif current_process in queue2:
-                queue3.append(current_process)
-            else:
-                queue3.append(current_process)
-
-    return completed
+            # Move to the next lower queue; the last queue keeps it
+            queues[min(level + 1, 2)].append(entry)
+
+
+def _preemptive_core(arrivals, completed, slices=None, progress=None, total=0, remaining_key=False,
+                     events=False):
+    # Discrete-event core: the clock jumps straight to the next arrival or
+    # completion, so the cost is O(n log n) whatever the burst lengths. An
+    # arrival with a strictly smaller key preempts the running process. With
+    # remaining_key the key is the remaining burst time (SRTF).
+    ready_queue = []  # heap of [key, arrival rank, remaining, first_start, job]
+    running = None
+    slice_start = 0
+    current_time = 0
+    admitted = 0
+    done = 0
+    upcoming = next(arrivals, None)
+
+    while upcoming is not None or ready_queue or running is not None:
+        if running is None:
+            if not ready_queue:
+                # CPU is idle, jump to next process arrival
+                current_time = max(current_time, upcoming[0])
+            while upcoming is not None and upcoming[0] <= current_time:
+                heapq.heappush(ready_queue, [upcoming[2], admitted, upcoming[1], -1, upcoming[3]])
+                admitted += 1
+                upcoming = next(arrivals, None)
+            running = heapq.heappop(ready_queue)
+            if running[3] < 0:
+                running[3] = current_time
+            slice_start = current_time
+            if events:
+                yield DISPATCH, current_time, running[4]
+
+        finish_time = current_time + running[2]
+        if upcoming is not None and upcoming[0] < finish_time:
+            # Arrival event: run up to it, then admit everything arriving then
+            running[2] -= upcoming[0] - current_time
+            current_time = upcoming[0]
+            if remaining_key:
+                running[0] = running[2]
+            while upcoming is not None and upcoming[0] <= current_time:
+                heapq.heappush(ready_queue, [upcoming[2], admitted, upcoming[1], -1, upcoming[3]])
+                admitted += 1
+                upcoming = next(arrivals, None)
+            if ready_queue[0][0] < running[0]:
+                if slices is not None:
+                    slices.append((running[4], slice_start, current_time))
+                if events:
+                    yield PREEMPT, current_time, running[4]
+                heapq.heappush(ready_queue, running)
+                running = None
+        else:
+            # Completion event
+            current_time = finish_time
+            if slices is not None:
+                slices.append((running[4], slice_start, current_time))
+            if events:
+                yield COMPLETE, current_time, running[4]
+            completed.append((running[4], running[3], current_time))
+            running = None
+            done += 1
+            if progress is not None and not done % PROGRESS_INTERVAL:
+                progress(done, total)
+
+
+def _arrival_order(table, key=None):
+    # Core input tuples for the table's rows in arrival order, ties by key,
+    # then row; without a key every key is 0 (first come, first served)
+    keys = np.zeros(len(table), dtype=np.int64) if key is None else getattr(table, key)
+    rows = np.lexsort((keys, table.arrival_time)) if key is not None else \
+        np.argsort(table.arrival_time, kind="stable")
+    instrumentation.count("sorts")
+    return zip(table.arrival_time[rows].tolist(), table.burst_time[rows].tolist(),
+               keys[rows].tolist(), rows.tolist())
+
+
+def _run_core(table, core, key=None, preemptive=False, progress=None, **params):
+    # Feed the table's rows to a core in arrival order and build the
+    # Schedule from what it reports
+    completed = []
+    slices = [] if preemptive else None
+    _run_to_end(core(_arrival_order(table, key), completed, slices, progress, len(table), **params))
+
+    completed = _columns(completed)
+    if slices is not None:
+        slices = _columns(slices).T
+    schedule = _completed(table, completed[:, 0], completed[:, 1], completed[:, 2], slices)
+    instrumentation.record_run(len(completed), len(completed) if slices is None else slices.shape[1],
+                               schedule.timelines)
+    return schedule
+
+
+def _columns(records, width=3):
+    # List of int tuples of length `width` as an (n, width) int64 array
+    flat = np.fromiter(itertools.chain.from_iterable(records), np.int64, width * len(records))
+    return flat.reshape(-1, width)
+
+
+@_schedules
+def sjf_non_preemptive(table, progress=None):
+    # Shortest Job First: smallest burst_time is dispatched first
+    return _run_core(table, _non_preemptive_core, "burst_time", progress=progress)
+
+
+@_schedules
+def priority_non_preemptive(table, progress=None):
+    # Lower number = higher priority
+    return _run_core(table, _non_preemptive_core, "priority", progress=progress)
+
+
+@_schedules
+def srtf(table, progress=None):
+    # Shortest Remaining Time First: preemptive SJF
+    return _run_core(table, _preemptive_core, "burst_time", preemptive=True, progress=progress,
+                     remaining_key=True)
+
+
+@_schedules
+def priority_preemptive(table, progress=None):
+    # Lower number = higher priority; a higher-priority arrival preempts
+    return _run_core(table, _preemptive_core, "priority", preemptive=True, progress=progress)
+
+
+@_schedules
+def round_robin(table, time_quantum, progress=None):
+    return _run_core(table, _round_robin_core, preemptive=True, progress=progress, time_quantum=time_quantum)
+
+
+@_schedules
+def mlfq(table, q1=4, q2=8, progress=None):
+    return _run_core(table, _mlfq_core, preemptive=True, progress=progress, q1=q1, q2=q2)
+
+
+# Algorithms by name, for callers that select them at run time
+ALGORITHMS = {
+    "fcfs": fcfs,
+    "sjf_non_preemptive": sjf_non_preemptive,
+    "priority_non_preemptive": priority_non_preemptive,
+    "srtf": srtf,
+    "priority_preemptive": priority_preemptive,
+    "round_robin": round_robin,
+    "mlfq": mlfq,
+}
+
+# Cores and heap keys for arrival-ordered streams, used by streaming.py
+ONLINE_ALGORITHMS = {
+    "fcfs": (_non_preemptive_core, None),
+    "sjf_non_preemptive": (_non_preemptive_core, "burst_time"),
+    "priority_non_preemptive": (_non_preemptive_core, "priority"),
+    "srtf": (functools.partial(_preemptive_core, remaining_key=True), "burst_time"),
+    "priority_preemptive": (_preemptive_core, "priority"),
+    "round_robin": (_round_robin_core, None),
+    "mlfq": (_mlfq_core, None),
+}
+
+
+# --- Binary traces ---
+#
+# A saved Schedule: workload, results and execution slices as fixed-width
+# little-endian int64 records, so a reader can memory-map the file instead
+# of parsing it. Layout:
+#
+#   header        TRACE_HEADER: magic, version, flags, cores, processes,
+#                 index stride
+#   slice counts  one int64 per core
+#   time index    per core, the start of every index_stride-th slice
+#   (padding to a multiple of 64 bytes)
+#   payload       process records (completion order), then per core its
+#                 slice records and busy-time prefix sums (slices + 1 values)
+#
+# With TRACE_COMPRESSED set the payload is one zlib stream; read_trace
+# inflates it to a temporary file and maps that.
+
+TRACE_MAGIC = b"SCHTRACE"
+TRACE_VERSION = 1
+TRACE_COMPRESSED = 1
+TRACE_HEADER = struct.Struct("<8sHHIQII")
+TRACE_INDEX_STRIDE = 4096
+TRACE_PROCESS_RECORD = np.dtype([(name, "<i8") for name in
+                                 ProcessTable.workload_columns + ProcessTable.result_columns + ("order",)])
+TRACE_SLICE_RECORD = np.dtype([("row", "<i8"), ("start", "<i8"), ("end", "<i8")])
+TRACE_CHUNK = 1 << 16  # records converted per write
+
+
+def write_trace(schedule, path, compress=False, index_stride=TRACE_INDEX_STRIDE):
+    # Save `schedule` as a binary trace, converting TRACE_CHUNK records at a
+    # time
+    table = schedule.table
+    timelines = schedule.timelines
+    with open(path, "wb") as f:
+        f.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, TRACE_COMPRESSED if compress else 0,
+                                  len(timelines), len(table), index_stride, 0))
+        f.write(np.array([len(timeline) for timeline in timelines], dtype="<i8").tobytes())
+        for timeline in timelines:
+            f.write(np.ascontiguousarray(timeline.start[::index_stride], dtype="<i8").tobytes())
+        f.write(bytes(-f.tell() % 64))
+
+        compressor = zlib.compressobj() if compress else None
+        write = f.write if compressor is None else (lambda data: f.write(compressor.compress(data)))
+        columns = [getattr(table, name) for name in ProcessTable.workload_columns + ProcessTable.result_columns]
+        _write_records(write, TRACE_PROCESS_RECORD, columns + [schedule.order])
+        for timeline in timelines:
+            _write_records(write, TRACE_SLICE_RECORD, [timeline.row, timeline.start, timeline.end])
+            _write_records(write, np.dtype("<i8"), [timeline.busy_before])
+        if compressor is not None:
+            f.write(compressor.flush())
+
+
+def _write_records(write, dtype, columns):
+    size = len(columns[0])
+    for low in range(0, size, TRACE_CHUNK):
+        high = min(size, low + TRACE_CHUNK)
+        if dtype.names is None:
+            block = np.ascontiguousarray(columns[0][low:high], dtype=dtype)
+        else:
+            block = np.empty(high - low, dtype=dtype)
+            for name, column in zip(dtype.names, columns):
+                block[name] = column[low:high]
+        write(block.tobytes())
+
+
+def read_trace(path):
+    # Open a trace written by write_trace as a Schedule whose columns are
+    # read-only views of the memory-mapped file: nothing is parsed, and
+    # pages are read as the Gantt view or the metrics touch them
+    with open(path, "rb") as f:
+        header = f.read(TRACE_HEADER.size)
+        if len(header) < TRACE_HEADER.size or header[:8] != TRACE_MAGIC:
+            raise ValueError(f"{path}: not a schedule trace")
+        _, version, flags, cores, processes, index_stride, _ = TRACE_HEADER.unpack(header)
+        if version != TRACE_VERSION:
+            raise ValueError(f"{path}: unsupported trace version {version}")
+        counts = np.frombuffer(f.read(8 * cores), dtype="<i8").tolist()
+        indexes = [np.frombuffer(f.read(8 * -(-count // index_stride)), dtype="<i8") for count in counts]
+        payload_offset = f.tell() + -f.tell() % 64
+
+        size = processes * TRACE_PROCESS_RECORD.itemsize + sum(
+            count * TRACE_SLICE_RECORD.itemsize + (count + 1) * 8 for count in counts)
+        if not size:
+            payload = np.zeros(0, dtype=np.uint8)
+        elif flags & TRACE_COMPRESSED:
+            f.seek(payload_offset)
+            payload = np.memmap(_inflate(f), dtype=np.uint8, mode="r", shape=(size,))
+        else:
+            payload = np.memmap(path, dtype=np.uint8, mode="r", offset=payload_offset, shape=(size,))
+
+    position = processes * TRACE_PROCESS_RECORD.itemsize
+    records = payload[:position].view(TRACE_PROCESS_RECORD)
+    table = ProcessTable.__new__(ProcessTable)
+    for name in ProcessTable.workload_columns + ProcessTable.result_columns:
+        setattr(table, name, records[name])
+
+    timelines = []
+    for count, index in zip(counts, indexes):
+        end = position + count * TRACE_SLICE_RECORD.itemsize
+        slices = payload[position:end].view(TRACE_SLICE_RECORD)
+        position, end = end, end + (count + 1) * 8
+        busy_before = payload[position:end].view("<i8")
+        position = end
+        timelines.append(Timeline(slices["row"], slices["start"], slices["end"], busy_before, index, index_stride))
+    return Schedule(table, timelines[0], records["order"], timelines)
+
+
+def _inflate(f):
+    # Decompress the rest of `f` into an anonymous temporary file, a chunk at
+    # a time
+    decompressor = zlib.decompressobj()
+    out = tempfile.TemporaryFile()
+    while True:
+        data = f.read(1 << 20)
+        if not data:
+            break
+        out.write(decompressor.decompress(data))
+    out.write(decompressor.flush())
+    out.flush()
+    return out
@@ -0,0 +1,377 @@
+import argparse
+import csv
+import functools
+import inspect
+import json
+import subprocess
+import sys
+import time
+
+import instrumentation
+from cache import ScheduleCache
+from comparison import MEASURED_METRICS
+from metrics import TIMES
+from multicore import BALANCE_POLICIES, multicore
+from process import ProcessTable
+from scheduler import ALGORITHMS, schedule_events, write_trace
+from streaming import schedule_stream, stream_events
+from sweep import parse_values, sweep
+from workload_io import ResultWriter, iter_workload, read_workload
+
+# Headless batch runner: python -m scheduler_cli workload.csv -a fcfs -a round_robin:time_quantum=4
+# Only the scheduler modules are imported here, never PyQt5.
+
+STARTUP_TARGET_MS = 300  # interpreter start + imports, best of several runs
+
+PROCESS_COLUMNS = ProcessTable.workload_columns + ProcessTable.result_columns
+
+
+def parse_algorithm(text):
+    # "name" or "name:param=value,param=value"
+    name, _, params_text = text.partition(":")
+    if name not in ALGORITHMS:
+        raise argparse.ArgumentTypeError(
+            f"unknown algorithm '{name}' (choose from {', '.join(ALGORITHMS)})")
+    signature = inspect.signature(ALGORITHMS[name]).parameters
+    accepted = [p for p in signature if p not in ("table", "progress")]
+    params = {}
+    for item in filter(None, params_text.split(",")):
+        key, sep, value = item.partition("=")
+        if key not in accepted:
+            raise argparse.ArgumentTypeError(
+                f"{name} has no parameter '{key}' (parameters: {', '.join(accepted) or 'none'})")
+        try:
+            params[key] = int(value)
+        except ValueError:
+            sep = ""
+        if not sep or params[key] <= 0:
+            raise argparse.ArgumentTypeError(f"bad parameter '{item}', expected {key}=positive integer")
+    missing = [p for p in accepted if p not in params and signature[p].default is inspect.Parameter.empty]
+    if missing:
+        raise argparse.ArgumentTypeError(f"{name} needs {', '.join(f'{p}=N' for p in missing)}")
+    return name, params
+
+
+def parse_sweep(text):
+    # "name:param=values,param=values", values as in sweep.parse_values
+    name, _, grid_text = text.partition(":")
+    if name not in ALGORITHMS:
+        raise argparse.ArgumentTypeError(
+            f"unknown algorithm '{name}' (choose from {', '.join(ALGORITHMS)})")
+    accepted = [p for p in inspect.signature(ALGORITHMS[name]).parameters if p not in ("table", "progress")]
+    grid = {}
+    for item in filter(None, grid_text.split(",")):
+        key, sep, values = item.partition("=")
+        if key not in accepted:
+            raise argparse.ArgumentTypeError(
+                f"{name} has no parameter '{key}' (parameters: {', '.join(accepted) or 'none'})")
+        try:
+            grid[key] = parse_values(values)
+        except ValueError:
+            sep = ""
+        if not sep or not grid[key] or min(grid[key]) <= 0:
+            raise argparse.ArgumentTypeError(f"bad grid '{item}', expected {key}=START-STOP[:STEP] or A|B|C")
+    if not grid:
+        raise argparse.ArgumentTypeError(f"no parameter grid given for {name}")
+    return name, grid
+
+
+def run(table, name, params, cache=None, cores=1, balance="global"):
+    started = time.perf_counter()
+    if cores > 1:
+        schedule = multicore(table, name, cores, balance, **params)
+    elif cache is not None:
+        schedule = cache.schedule(table, name, params)
+    else:
+        schedule = ALGORITHMS[name](table, **params)
+    wall_clock = time.perf_counter() - started
+
+    metrics = {"algorithm": name, "params": params, "processes": len(schedule)}
+    if cores > 1:
+        metrics.update(cores=cores, balance=balance)
+    if len(schedule):
+        metrics.update(schedule.summary())
+    metrics["wall_clock_seconds"] = wall_clock
+    return schedule, metrics
+
+
+def params_text(params):
+    return ",".join(f"{key}={value}" for key, value in params.items())
+
+
+def label(name, params):
+    return f"{name}:{params_text(params)}" if params else name
+
+
+def write_processes(path, runs):
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("algorithm",) + PROCESS_COLUMNS)
+            for schedule, metrics in runs:
+                columns = [getattr(schedule.table, name).tolist() for name in PROCESS_COLUMNS]
+                algorithm = label(metrics["algorithm"], metrics["params"])
+                writer.writerows((algorithm,) + row for row in zip(*columns))
+        return
+
+    data = []
+    for schedule, metrics in runs:
+        columns = [getattr(schedule.table, name).tolist() for name in PROCESS_COLUMNS]
+        data.append({
+            "algorithm": metrics["algorithm"],
+            "params": metrics["params"],
+            "metrics": metrics,
+            "processes": [dict(zip(PROCESS_COLUMNS, row)) for row in zip(*columns)],
+        })
+    _write_json(path, {"runs": data})
+
+
+def write_metrics(path, runs):
+    rows = [metrics for _, metrics in runs]
+    if path.endswith(".csv"):
+        fields = ["workload", "algorithm", "params", "cores", "balance", "processes", "average_waiting_time", "average_turnaround_time",
+                  "average_response_time", "cpu_utilization", "throughput", "makespan"]
+        fields += [f"{stat}_{name}" for name in TIMES for stat in ("max", "p50", "p95", "p99")]
+        fields.append("wall_clock_seconds")
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+            writer.writeheader()
+            for metrics in rows:
+                writer.writerow(dict(metrics, params=params_text(metrics["params"])))
+        return
+    _write_json(path, {"runs": rows})
+
+
+def _write_json(path, data):
+    if path == "-":
+        json.dump(data, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+def check_startup(target_ms, runs=5):
+    # Time a fresh interpreter importing this module and make sure Qt stays out
+    probe = "import sys, scheduler_cli; print('PyQt5' in sys.modules)"
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    qt_loaded = output.stdout.strip() == "True"
+    best = min(timings)
+    report = {"startup_ms": round(best, 1), "target_ms": target_ms,
+              "within_target": best <= target_ms, "imports_qt": qt_loaded}
+    print(json.dumps(report))
+    return 0 if report["within_target"] and not qt_loaded else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m scheduler_cli",
+                                     description="Run scheduling algorithms on workload files without the GUI.")
+    parser.add_argument("workloads", nargs="*", help="workload files (.csv or .json)")
+    parser.add_argument("-a", "--algorithm", action="append", type=parse_algorithm, dest="algorithms",
+                        metavar="NAME[:PARAM=VALUE,...]",
+                        help=f"algorithm to run, repeatable ({', '.join(ALGORITHMS)})")
+    parser.add_argument("-o", "--output", help="per-process results file (.json or .csv)")
+    parser.add_argument("-m", "--metrics", help="aggregate metrics file (.json or .csv, '-' for stdout)")
+    parser.add_argument("--sweep", action="append", type=parse_sweep, dest="sweeps",
+                        metavar="NAME:PARAM=START-STOP[:STEP],...",
+                        help="sweep an algorithm over a parameter grid on all cores, repeatable "
+                             "(e.g. mlfq:q1=1-8,q2=2-16:2)")
+    parser.add_argument("--metric", default="average_waiting_time", choices=MEASURED_METRICS, metavar="METRIC",
+                        help="metric a sweep optimizes (default: average_waiting_time; any of "
+                             + ", ".join(MEASURED_METRICS) + ")")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes for sweeps (default: all cores)")
+    parser.add_argument("--cores", type=int, default=1, help="number of CPUs to simulate (default: 1)")
+    parser.add_argument("--balance", choices=BALANCE_POLICIES, default="global",
+                        help="how processes are spread over the CPUs with --cores (default: global)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="save each schedule as a binary trace (.trace) that the GUI can open")
+    parser.add_argument("--compress-trace", action="store_true", help="zlib-compress the --trace payload")
+    parser.add_argument("--events", metavar="FILE",
+                        help="write the dispatch/preempt/complete events of each run to a .csv or .jsonl "
+                             "file as they are generated")
+    parser.add_argument("--cache-dir", help="reuse results of earlier runs stored in this directory")
+    parser.add_argument("--stream", action="store_true",
+                        help="schedule the workload as an arrival-ordered stream in constant memory; "
+                             "per-process results go to a .csv or .jsonl file as processes finish")
+    parser.add_argument("--stats", metavar="FILE",
+                        help="write scheduler counters and per-phase times to a .json file")
+    parser.add_argument("--speedscope", metavar="FILE",
+                        help="write the phase timings as a speedscope profile (.json)")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="profile the run with cProfile and write the stats (.prof, for pstats/snakeviz)")
+    parser.add_argument("--check-startup", action="store_true",
+                        help="measure interpreter startup + import time against the target and exit")
+    parser.add_argument("--startup-target-ms", type=float, default=STARTUP_TARGET_MS)
+    args = parser.parse_args(argv)
+
+    if args.check_startup:
+        return check_startup(args.startup_target_ms)
+    if not args.workloads:
+        parser.error("no workload files given")
+    if args.cores < 1:
+        parser.error("--cores must be at least 1")
+    if args.cores > 1 and (args.sweeps or args.stream):
+        parser.error("--cores works with -a runs only, not with --sweep or --stream")
+    if args.trace and (args.sweeps or args.stream):
+        parser.error("--trace works with -a runs only, not with --sweep or --stream")
+    if args.events and (args.sweeps or args.cores > 1):
+        parser.error("--events works with single-CPU -a runs only")
+    cache = ScheduleCache(directory=args.cache_dir) if args.cache_dir else None
+    if not args.sweeps and not args.algorithms:
+        parser.error("no algorithm given (use -a NAME or --sweep)")
+    if args.output is None and args.metrics is None:
+        args.metrics = "-"
+
+    if not (args.stats or args.speedscope or args.profile):
+        return run_workloads(args, cache)
+    instrumentation.enable(profile=bool(args.profile))
+    try:
+        return run_workloads(args, cache)
+    finally:
+        if args.profile:
+            instrumentation.write_profile(args.profile)
+        if args.stats:
+            instrumentation.write_json(args.stats)
+        if args.speedscope:
+            instrumentation.write_speedscope(args.speedscope)
+        instrumentation.disable()
+
+
+def run_workloads(args, cache=None):
+    if args.sweeps:
+        return sweep_workloads(args, cache)
+    if args.stream:
+        return stream_workloads(args)
+
+    for workload in args.workloads:
+        try:
+            table = read_workload(workload)
+        except (OSError, ValueError) as error:
+            print(f"error: {error}", file=sys.stderr)
+            return 1
+
+        runs = []
+        for name, params in args.algorithms:
+            schedule, metrics = run(table, name, params, cache, args.cores, args.balance)
+            metrics["workload"] = workload
+            runs.append((schedule, metrics))
+
+        if args.output:
+            write_processes(_output_path(args.output, workload, len(args.workloads)), runs)
+        if args.metrics:
+            write_metrics(_output_path(args.metrics, workload, len(args.workloads)), runs)
+        if args.trace:
+            path = _output_path(args.trace, workload, len(args.workloads))
+            for schedule, metrics in runs:
+                # One file per run: run.trace becomes run.<algorithm>-<params>.trace
+                name = "-".join(filter(None, (metrics["algorithm"], params_text(metrics["params"]))))
+                write_trace(schedule, _output_path(path, name, len(runs)), args.compress_trace)
+        if args.events:
+            write_events(_output_path(args.events, workload, len(args.workloads)), workload, args.algorithms, table)
+    return 0
+
+
+def sweep_workloads(args, cache=None):
+    for workload in args.workloads:
+        try:
+            table = read_workload(workload)
+        except (OSError, ValueError) as error:
+            print(f"error: {error}", file=sys.stderr)
+            return 1
+
+        results = [sweep(table, name, grid, args.metric, max_workers=args.jobs, cache=cache)
+                   for name, grid in args.sweeps]
+        path = _output_path(args.metrics or args.output or "-", workload, len(args.workloads))
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["workload", "algorithm", "params", args.metric, "best"])
+                for result in results:
+                    best = result.best
+                    for row in result.rows:
+                        writer.writerow([workload, result.algorithm, params_text(row["params"]),
+                                         row.get(args.metric, ""), row is best])
+        else:
+            _write_json(path, {"sweeps": [{
+                "workload": workload,
+                "algorithm": result.algorithm,
+                "metric": args.metric,
+                "axes": result.axes,
+                "matrix": result.matrix().tolist(),
+                "best": result.best,
+                "runs": result.rows,
+            } for result in results]})
+    return 0
+
+
+def stream_workloads(args):
+    for workload in args.workloads:
+        writer = ResultWriter(_output_path(args.output, workload, len(args.workloads))) if args.output else None
+        runs = []
+        try:
+            for name, params in args.algorithms:
+                sink = None
+                if writer is not None:
+                    sink = functools.partial(writer.write, algorithm=label(name, params))
+                started = time.perf_counter()
+                running = schedule_stream(iter_workload(workload), name, sink, **params)
+                metrics = {"algorithm": name, "params": params, "processes": running.count}
+                metrics.update(running.summary())
+                metrics["wall_clock_seconds"] = time.perf_counter() - started
+                metrics["workload"] = workload
+                runs.append((None, metrics))
+        except (OSError, ValueError) as error:
+            print(f"error: {error}", file=sys.stderr)
+            return 1
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if args.metrics:
+            write_metrics(_output_path(args.metrics, workload, len(args.workloads)), runs)
+        if args.events:
+            try:
+                write_events(_output_path(args.events, workload, len(args.workloads)), workload, args.algorithms)
+            except (OSError, ValueError) as error:
+                print(f"error: {error}", file=sys.stderr)
+                return 1
+    return 0
+
+
+def write_events(path, workload, algorithms, table=None):
+    # Event log of each run, written as the events are generated; without a
+    # table the workload is streamed from its file
+    with open(path, "w", newline="") as f:
+        writer = None if path.endswith(".jsonl") else csv.writer(f)
+        if writer is not None:
+            writer.writerow(("algorithm", "event", "time", "pid"))
+        for name, params in algorithms:
+            if table is None:
+                events = ((kind, time, spec.pid)
+                          for kind, time, spec in stream_events(iter_workload(workload), name, **params))
+            else:
+                pids = table.pid.tolist()
+                events = ((kind, time, pids[row]) for kind, time, row in schedule_events(table, name, **params))
+            algorithm = label(name, params)
+            if writer is not None:
+                writer.writerows((algorithm, kind, time, pid) for kind, time, pid in events)
+            else:
+                f.writelines(json.dumps({"algorithm": algorithm, "event": kind, "time": time, "pid": pid}) + "\n"
+                             for kind, time, pid in events)
+
+
+def _output_path(path, workload, workload_count):
+    # With several workloads, results.csv becomes results.<workload name>.csv
+    if workload_count == 1 or path == "-":
+        return path
+    stem = workload.replace("\\", "/").rsplit("/", 1)[-1].rsplit(".", 1)[0]
+    base, dot, extension = path.rpartition(".")
+    return f"{base}.{stem}.{extension}" if dot else f"{path}.{stem}"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import instrumentation
+from metrics import MetricsAccumulator
+from process import ProcessResult
+from scheduler import ONLINE_ALGORITHMS, _Discard, _run_to_end
+
+# Online scheduling of arrival-ordered process streams. Processes are pulled
+# from the source only when the simulated clock reaches them and each result
+# is handed to the sink as soon as the process finishes, so memory is bounded
+# by the ready queue rather than by the length of the trace.
+
+
+class _Completions:
+    # Stands in for the `completed` list of a scheduler core
+    def __init__(self, sink, metrics):
+        self.sink = sink
+        self.metrics = metrics
+
+    def append(self, item):
+        spec, start, finish = item
+        turnaround = finish - spec.arrival_time
+        result = ProcessResult(spec.pid, spec.arrival_time, spec.burst_time, spec.priority, start, finish,
+                               turnaround - spec.burst_time, turnaround, start - spec.arrival_time)
+        self.metrics.add(spec.arrival_time, spec.burst_time, start, finish)
+        if self.sink is not None:
+            self.sink(result)
+
+
+class _SliceCounter:
+    # Stands in for the `slices` list while instrumentation is on: counts
+    # dispatches, context switches and idle jumps without keeping the slices
+    def __init__(self):
+        self.dispatches = 0
+        self.context_switches = 0
+        self.idle_jumps = 0
+        self.last_job = None
+        self.last_end = 0
+
+    def append(self, item):
+        job, start, end = item
+        self.dispatches += 1
+        if self.last_job is not None and job is not self.last_job:
+            self.context_switches += 1
+        if start > self.last_end:
+            self.idle_jumps += 1
+        self.last_job = job
+        self.last_end = end
+
+
+def _arrivals(source, key):
+    # Core input tuples; the stream must already be in arrival order
+    last_arrival = None
+    for spec in source:
+        if last_arrival is not None and spec.arrival_time < last_arrival:
+            raise ValueError(f"stream is not in arrival order at PID {spec.pid}")
+        last_arrival = spec.arrival_time
+        yield (spec.arrival_time, spec.burst_time, 0 if key is None else getattr(spec, key), spec)
+
+
+def schedule_stream(source, algorithm, sink=None, progress=None, **params):
+    # Schedule the ProcessSpec entries of `source` (any iterable, e.g.
+    # workload_io.iter_workload(path)) with the named algorithm, calling
+    # sink(result) for each finished process. Returns the MetricsAccumulator
+    # the results were fed into. progress(done, 0) is called periodically;
+    # the total is unknown.
+    core, key = ONLINE_ALGORITHMS[algorithm]
+    metrics = MetricsAccumulator()
+    slices = _SliceCounter() if instrumentation.enabled else None
+    with instrumentation.phase("schedule"):
+        _run_to_end(core(_arrivals(source, key), _Completions(sink, metrics), slices, progress, 0, **params))
+    if slices is not None:
+        instrumentation.record_run(metrics.count, slices.dispatches)
+        instrumentation.count("context_switches", slices.context_switches)
+        instrumentation.count("idle_jumps", slices.idle_jumps)
+    return metrics
+
+
+def stream_events(source, algorithm, **params):
+    # Generator of (kind, time, spec) events for an arrival-ordered stream,
+    # as scheduler.schedule_events: the source is read only as far as the
+    # consumer has advanced the clock
+    core, key = ONLINE_ALGORITHMS[algorithm]
+    return core(_arrivals(source, key), _Discard(), events=True, **params)
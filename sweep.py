@@ -0,0 +1,71 @@
+import itertools
+
+import numpy as np
+
+from comparison import HIGHER_IS_BETTER, measure_all
+from process import ProcessTable
+
+# Parameter sweeps: run one algorithm over a grid of parameter values on every
+# core. Each worker receives the workload once and reuses it for all the grid
+# points it is handed.
+
+
+class SweepResult:
+    # `axes` maps each swept parameter to its values, in grid order; `rows`
+    # holds the metrics of every grid point and `matrix(metric)` reshapes one
+    # metric to the grid, one dimension per parameter.
+    def __init__(self, algorithm, axes, rows, metric):
+        self.algorithm = algorithm
+        self.axes = axes
+        self.rows = rows
+        self.metric = metric
+
+    def matrix(self, metric=None):
+        metric = metric or self.metric
+        values = [row.get(metric, np.nan) for row in self.rows]
+        return np.array(values, dtype=float).reshape([len(v) for v in self.axes.values()])
+
+    @property
+    def best(self):
+        # Row with the best value of the sweep metric
+        scored = [row for row in self.rows if self.metric in row]
+        if not scored:
+            return None
+        choose = max if self.metric in HIGHER_IS_BETTER else min
+        return choose(scored, key=lambda row: row[self.metric])
+
+    def __repr__(self):
+        best = self.best
+        return f"SweepResult({self.algorithm}, {len(self.rows)} runs, best={best and best['params']})"
+
+
+def sweep(workload, algorithm, grid, metric="average_waiting_time", max_workers=None, progress=None,
+          cache=None):
+    # Run `algorithm` for every combination of the values in `grid`
+    # ({param: values}) across a process pool and return a SweepResult.
+    # Grid points already in `cache` are not rerun.
+    if not isinstance(workload, ProcessTable):
+        workload = ProcessTable.from_processes(workload)
+    axes = {name: list(values) for name, values in grid.items()}
+    runs = [(algorithm, dict(zip(axes, values))) for values in itertools.product(*axes.values())]
+    rows = measure_all(workload, runs, max_workers, progress, cache)
+    return SweepResult(algorithm, axes, rows, metric)
+
+
+def sweep_round_robin(workload, quanta, metric="average_waiting_time", **kwargs):
+    return sweep(workload, "round_robin", {"time_quantum": quanta}, metric, **kwargs)
+
+
+def sweep_mlfq(workload, q1_values, q2_values, metric="average_waiting_time", **kwargs):
+    return sweep(workload, "mlfq", {"q1": q1_values, "q2": q2_values}, metric, **kwargs)
+
+
+def parse_values(text):
+    # "1-20" (inclusive range), "2-16:2" (with step) or "1|2|4" (list)
+    if "|" in text:
+        return [int(value) for value in text.split("|")]
+    bounds, _, step = text.partition(":")
+    start, dash, stop = bounds.partition("-")
+    if not dash:
+        return [int(start)]
+    return list(range(int(start), int(stop) + 1, int(step or 1)))
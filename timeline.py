@@ -0,0 +1,112 @@
+import numpy as np
+
+IDLE = -1  # row value of an idle gap
+
+
+class Timeline:
+    # Run-length-encoded execution history of one CPU. Slice i runs `row[i]`
+    # (a row of the scheduled ProcessTable, or IDLE) from start[i] to end[i].
+    # Slices are contiguous from time 0 and adjacent slices of the same row
+    # are merged, so the buffers grow with context switches, not with time.
+    #
+    # The columns may be memory-mapped (scheduler.read_trace); a coarse time
+    # index, the start of every `index_stride`-th slice, then keeps lookups
+    # to one block of the file.
+    def __init__(self, row=(), start=(), end=(), busy_before=None, index=None, index_stride=0):
+        self.row = np.asarray(row, dtype=np.int64)
+        self.start = np.asarray(start, dtype=np.int64)
+        self.end = np.asarray(end, dtype=np.int64)
+        self._busy_before = busy_before
+        self.index = index
+        self.index_stride = index_stride
+
+    @classmethod
+    def from_slices(cls, row, start, end):
+        # Build from execution slices in time order: fill idle gaps and merge
+        # back-to-back slices of the same row
+        row = np.asarray(row, dtype=np.int64)
+        start = np.asarray(start, dtype=np.int64)
+        end = np.asarray(end, dtype=np.int64)
+        keep = end > start
+        row, start, end = row[keep], start[keep], end[keep]
+        if not len(row):
+            return cls()
+
+        previous_end = np.concatenate(([0], end[:-1]))
+        gaps = np.flatnonzero(start > previous_end)
+        row = np.insert(row, gaps, IDLE)
+        end = np.insert(end, gaps, start[gaps])
+        start = np.insert(start, gaps, previous_end[gaps])
+
+        first = np.ones(len(row), dtype=bool)
+        first[1:] = row[1:] != row[:-1]
+        runs = np.flatnonzero(first)
+        return cls(row[runs], start[runs], np.append(end[runs[1:] - 1], end[-1]))
+
+    def __len__(self):
+        return len(self.row)
+
+    def __iter__(self):
+        return zip(self.row.tolist(), self.start.tolist(), self.end.tolist())
+
+    def __repr__(self):
+        return f"Timeline({len(self)} slices, end={self.end_time})"
+
+    @property
+    def end_time(self):
+        return int(self.end[-1]) if len(self) else 0
+
+    @property
+    def busy_before(self):
+        # Busy (non-idle) time before each slice, then the total: len + 1 values
+        if self._busy_before is None:
+            busy = np.where(self.row != IDLE, self.end - self.start, 0)
+            self._busy_before = np.concatenate(([0], np.cumsum(busy)))
+        return self._busy_before
+
+    def relabel(self, mapping):
+        # Timeline with every non-idle row replaced by mapping[row]
+        mapping = np.asarray(mapping, dtype=np.int64)
+        row = self.row.copy()
+        busy = row != IDLE
+        row[busy] = mapping[row[busy]]
+        return Timeline(row, self.start, self.end)
+
+    def index_at(self, time):
+        # Index of the slice covering `time`, or None outside [0, end_time)
+        index = self._search(self.start, time, "right") - 1
+        if index < 0 or time >= self.end[index]:
+            return None
+        return index
+
+    def running_at(self, time):
+        # Row running at `time` (IDLE during gaps), or None outside the timeline
+        index = self.index_at(time)
+        return None if index is None else int(self.row[index])
+
+    def next_busy(self, time):
+        # Earliest time >= `time` at which a process runs, or None if none does
+        index = self.index_at(time)
+        if index is None:
+            return None if time >= self.end_time or not len(self) else int(self.start[0])
+        if self.row[index] != IDLE:
+            return time
+        # Adjacent idle slices are merged, so the next one is busy
+        return int(self.end[index]) if index + 1 < len(self) else None
+
+    def window(self, begin, end):
+        # Index range [first, last) of the slices overlapping [begin, end)
+        first = self._search(self.end, begin, "right")
+        last = self._search(self.start, end, "left")
+        return first, max(first, last)
+
+    def _search(self, column, value, side):
+        # np.searchsorted on the start or end column. With a time index only
+        # one block is searched: slices are contiguous (end[i] == start[i + 1]),
+        # so both answers lie within the block whose first start is <= value.
+        if self.index is None:
+            return int(np.searchsorted(column, value, side=side))
+        block = max(0, int(np.searchsorted(self.index, value, side="right")) - 1)
+        low = block * self.index_stride
+        high = min(len(self), low + self.index_stride)
+        return low + int(np.searchsorted(column[low:high], value, side=side))
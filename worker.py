@@ -0,0 +1,57 @@
+import threading
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from scheduler import SchedulingCancelled
+
+
+class Worker(QObject):
+    # Runs job(progress) on its own QThread and hands the result back through
+    # signals, which Qt delivers on the GUI thread. The job passes `progress`
+    # on to the scheduler; after cancel() the next progress call raises
+    # SchedulingCancelled. Call cancel() directly rather than connecting a
+    # signal to it: queued calls would wait for the busy worker thread. The
+    # thread quits itself once the job is done (a queued quit would wait for
+    # the GUI thread, which may be blocked in wait()).
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self._cancel = threading.Event()
+
+        self.thread = QThread()
+        self.moveToThread(self.thread)
+        self.thread.started.connect(self.run)
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def wait(self):
+        self.thread.wait()
+
+    def is_running(self):
+        return self.thread.isRunning()
+
+    def report(self, done, total):
+        if self._cancel.is_set():
+            raise SchedulingCancelled()
+        self.progress.emit(done, total)
+
+    def run(self):
+        try:
+            result = self.job(self.report)
+        except SchedulingCancelled:
+            self.cancelled.emit()
+        except Exception as error:
+            self.failed.emit(str(error))
+        else:
+            self.finished.emit(result)
+        finally:
+            self.thread.quit()
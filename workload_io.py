@@ -0,0 +1,178 @@
+import csv
+import json
+
+import numpy as np
+
+import instrumentation
+from process import ProcessResult, ProcessSpec, ProcessTable
+
+# Workload files: CSV with a header row naming the columns, JSON holding a
+# list of process objects (optionally under a "processes" key) or JSON Lines
+# with one process object per line. Column names are the Process attribute
+# names; "arrival" / "burst" are accepted too and "priority" is optional.
+#
+# read_* load a whole file into a ProcessTable. iter_* stream ProcessSpec
+# entries one at a time in file order, for traces too large to hold in memory.
+
+COLUMN_ALIASES = {
+    "pid": "pid",
+    "arrival_time": "arrival_time",
+    "arrival": "arrival_time",
+    "burst_time": "burst_time",
+    "burst": "burst_time",
+    "priority": "priority",
+}
+
+
+def _column_names(header, path):
+    names = []
+    for name in header:
+        key = name.strip().lower()
+        if key not in COLUMN_ALIASES:
+            raise ValueError(f"{path}: unknown column '{name}'")
+        names.append(COLUMN_ALIASES[key])
+    for required in ("pid", "arrival_time", "burst_time"):
+        if required not in names:
+            raise ValueError(f"{path}: missing column '{required}'")
+    return names
+
+
+def _check(pid, arrival_time, burst_time, where):
+    if burst_time <= 0:
+        raise ValueError(f"{where}: burst time of PID {pid} must be positive")
+    if arrival_time < 0:
+        raise ValueError(f"{where}: arrival time of PID {pid} must not be negative")
+
+
+def _table(columns, path):
+    invalid = np.flatnonzero((columns["burst_time"] <= 0) | (columns["arrival_time"] < 0))
+    if len(invalid):
+        row = invalid[0]
+        _check(columns["pid"][row], columns["arrival_time"][row], columns["burst_time"][row], path)
+    return ProcessTable(columns["pid"], columns["arrival_time"], columns["burst_time"], columns.get("priority"))
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        header = next(csv.reader(f), None)
+        if header is None:
+            raise ValueError(f"{path}: empty workload file")
+        names = _column_names(header, path)
+        values = np.loadtxt(f, delimiter=",", dtype=np.int64, ndmin=2)
+    if values.shape[0] and values.shape[1] != len(names):
+        raise ValueError(f"{path}: expected {len(names)} columns, found {values.shape[1]}")
+    columns = {name: values[:, i] if values.shape[0] else np.zeros(0, np.int64) for i, name in enumerate(names)}
+    return _table(columns, path)
+
+
+def read_json(path):
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("processes", [])
+    if not data:
+        return ProcessTable([], [], [])
+    names = _column_names(data[0].keys(), path)
+    columns = {}
+    try:
+        for key, name in zip(data[0].keys(), names):
+            columns[name] = np.fromiter((int(item[key]) for item in data), np.int64, len(data))
+    except KeyError as error:
+        raise ValueError(f"{path}: process without '{error.args[0]}'") from None
+    return _table(columns, path)
+
+
+def read_jsonl(path):
+    return ProcessTable.from_processes(list(iter_jsonl(path)))
+
+
+def read_workload(path):
+    name = str(path).lower()
+    with instrumentation.phase("parse"):
+        if name.endswith(".json"):
+            return read_json(path)
+        if name.endswith(".jsonl"):
+            return read_jsonl(path)
+        return read_csv(path)
+
+
+def iter_csv(path):
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        names = _column_names(header, path)
+        positions = [names.index(name) if name in names else None for name in ProcessTable.workload_columns]
+        for line_number, row in enumerate(reader, 2):
+            if not row:
+                continue
+            try:
+                values = [0 if i is None else int(row[i]) for i in positions]
+            except (IndexError, ValueError):
+                raise ValueError(f"{path}:{line_number}: expected {len(names)} integers") from None
+            _check(values[0], values[1], values[2], f"{path}:{line_number}")
+            yield ProcessSpec(*values)
+
+
+def iter_jsonl(path):
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            item = {COLUMN_ALIASES.get(key.lower(), key): value for key, value in json.loads(line).items()}
+            try:
+                spec = ProcessSpec(int(item["pid"]), int(item["arrival_time"]), int(item["burst_time"]),
+                                   int(item.get("priority", 0)))
+            except KeyError as error:
+                raise ValueError(f"{path}:{line_number}: process without '{error.args[0]}'") from None
+            _check(spec.pid, spec.arrival_time, spec.burst_time, f"{path}:{line_number}")
+            yield spec
+
+
+def iter_workload(path):
+    name = str(path).lower()
+    if name.endswith(".jsonl"):
+        return iter_jsonl(path)
+    if name.endswith(".json"):
+        return iter(read_json(path).to_specs())
+    return iter_csv(path)
+
+
+class ResultWriter:
+    # Output sink for completed processes: CSV (.csv) or JSON Lines (any other
+    # extension), written one record at a time. Use as a context manager or
+    # call close().
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "w", newline="")
+        self.csv = str(path).lower().endswith(".csv")
+        if self.csv:
+            self.file.write(",".join(("algorithm",) + ProcessResult.__slots__) + "\n")
+            self._format = "%s," + ",".join(["%d"] * len(ProcessResult.__slots__)) + "\n"
+        else:
+            # All fields are integers, so each record is one fixed %-format
+            fields = ", ".join(f'"{name}": %d' for name in ProcessResult.__slots__)
+            self._format = "{" + fields + ', "algorithm": %s}\n'
+
+    def write(self, result, algorithm=""):
+        values = tuple(getattr(result, name) for name in ProcessResult.__slots__)
+        if self.csv:
+            self.file.write(self._format % ((_csv_field(algorithm),) + values))
+        else:
+            self.file.write(self._format % (values + (json.dumps(algorithm),)))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _csv_field(text):
+    if any(c in text for c in ',"\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text